@@ -1,24 +1,34 @@
 from __future__ import annotations
 
 import ast
+import collections
 import contextlib
 import dataclasses
 import functools
-import inspect
 import os
+import pathlib
 import types
+from collections.abc import Iterable
 
 from etils import epy
 
-from apitree import import_utils
+from apitree import cache_utils, import_utils, profile_utils
 
 
 @dataclasses.dataclass
 class ImportAlias:
-  """Represents an import symbol."""
+  """Represents an import symbol.
+
+  Attributes:
+    namespace: Imported symbol (e.g. `a.b.c`)
+    alias: Name of the symbol in the module
+    is_module: Whether the import is an `import xxx` statement (so the alias
+      is a module)
+  """
 
   namespace: str
   alias: str
+  is_module: bool = dataclasses.field(default=False, compare=False)
 
 
 class _GlobalImportVisitor(ast.NodeVisitor):
@@ -29,7 +39,11 @@ class _GlobalImportVisitor(ast.NodeVisitor):
   def visit_Import(self, node):
     for alias in node.names:
       self.symbols.append(
-          ImportAlias(alias.name, alias.asname or alias.name.split('.', 1)[0])
+          ImportAlias(
+              alias.name,
+              alias.asname or alias.name.split('.', 1)[0],
+              is_module=True,
+          )
       )
     self.generic_visit(node)
 
@@ -58,9 +72,11 @@ def parse_global_imports(content: str | types.ModuleType) -> list[ImportAlias]:
 
   """
   if isinstance(content, types.ModuleType):
-    content = inspect.getsource(content)
-  tree = ast.parse(content)
+    return module_source(content.__name__).imports
+  return _parse_global_imports(ast.parse(content))
+
 
+def _parse_global_imports(tree: ast.Module) -> list[ImportAlias]:
   visitor = _GlobalImportVisitor()
   visitor.visit(tree)
 
@@ -104,7 +120,7 @@ class _SymbolDefinition:
   def docstring(self) -> str:
     # TODO(epot): Should also support `Attributes:` docstring
     # What if the `Attributes:` is hidden in the import chain ?
-    lines = import_utils.module_lines(self.module_name)
+    lines = module_source(self.module_name).lines
     docstring_lines = []
     for lines_no in range(self.start - 2, 0, -1):
       line = lines[lines_no].strip()
@@ -116,7 +132,7 @@ class _SymbolDefinition:
 
   @property
   def code(self) -> str:
-    lines = import_utils.module_lines(self.module_name)
+    lines = module_source(self.module_name).lines
     lines = lines[self.start - 1 : self.end]
     return '\n'.join(lines)
 
@@ -125,26 +141,13 @@ class _SymbolDefinition:
 class _ImportedSymbol(_SymbolDefinition):
   import_module_name: str
   symbol_name: str
+  # Definition of the `except ImportError:` branch, used when the imported
+  # module is not installed (optional dependencies)
+  fallback: _SymbolDefinition | None = None
 
   @property
   def last_project_symbol(self) -> _SymbolDefinition:
-    if not self.belong_to_project:
-      raise ValueError(f'{self.module_name} is not part of the project.')
-
-    # No need to load the child if it do not belong to the module
-    if import_utils.repo_relative_path(self.import_module_name) is None:
-      return self
-
-    sub_symbols = extract_symbols(self.import_module_name)
-    if self.symbol_name not in sub_symbols:
-      raise ValueError(
-          f'`{self.symbol_name}` not found in `{self.import_module_name}`'
-      )
-    sub = sub_symbols[self.symbol_name]
-    if not sub.belong_to_project:  # The child do not bellong to the project
-      return self
-
-    return sub.last_project_symbol  # Recurse
+    return _resolve_last_project_symbol(self)
 
 
 @dataclasses.dataclass
@@ -158,9 +161,14 @@ class _DeclaredSymbol(_SymbolDefinition):
 
 class _GlobalAssignementExtractor(ast.NodeVisitor):
 
-  def __init__(self, module_name: str):
+  def __init__(self, module_name: str, *, is_package: bool):
     self._module_name = module_name
+    self._is_package = is_package
     self.symbols: dict[str, _SymbolDefinition] = {}
+    # `from xxx import *`
+    self.star_imports: list[_ImportedSymbol] = []
+    # Statically known `__all__` (`None` if not defined or dynamic)
+    self.all_names: list[str] | None = None
 
     self._should_capture = None
 
@@ -176,8 +184,6 @@ class _GlobalAssignementExtractor(ast.NodeVisitor):
     assert self._should_capture
     self._should_capture = None
 
-  # TODO(epot): Support `ast.NamedExpr` (`:=`)
-
   def visit_Name(self, node: ast.Name):  # x = y
     if self._should_capture:
       self.symbols[node.id] = self._should_capture
@@ -186,30 +192,87 @@ class _GlobalAssignementExtractor(ast.NodeVisitor):
     with self._capture(node):
       for target in node.targets:
         self.visit(target)
+    self._visit_all(node.targets, node.value)
+    self.visit(node.value)  # Walrus inside the value: `x = (y := 1)`
 
   def visit_AnnAssign(self, node: ast.AnnAssign):  # x: int = y
     with self._capture(node):
       self.visit(node.target)
+    if node.value is not None:
+      self._visit_all([node.target], node.value)
+      self.visit(node.value)
+
+  def visit_AugAssign(self, node: ast.AugAssign):  # __all__ += [...]
+    if (
+        isinstance(node.target, ast.Name)
+        and node.target.id == '__all__'
+        and isinstance(node.op, ast.Add)
+        and self.all_names is not None
+    ):
+      names = _literal_names(node.value)
+      self.all_names = None if names is None else self.all_names + names
+    self.generic_visit(node)  # Walrus inside the value
+
+  def _visit_all(self, targets: list[ast.expr], value: ast.expr) -> None:
+    if any(isinstance(t, ast.Name) and t.id == '__all__' for t in targets):
+      self.all_names = _literal_names(value)
+
+  def visit_NamedExpr(self, node: ast.NamedExpr):  # (x := y)
+    self.symbols[node.target.id] = _AssignedSymbol(
+        module_name=self._module_name,
+        start=node.lineno,
+        end=node.end_lineno,
+    )
+    self.visit(node.value)
+
+  def visit_Try(self, node: ast.Try):
+    # The `try` body is the expected code path (e.g. `except ImportError:`
+    # fallbacks), so is visited last to have priority.
+    before = dict(self.symbols)
+    for child in node.handlers:
+      self.visit(child)
+    fallbacks = {
+        name: symbol
+        for name, symbol in self.symbols.items()
+        if before.get(name) is not symbol
+    }
+    for child in [*node.body, *node.orelse, *node.finalbody]:
+      self.visit(child)
+    # The handlers definitions are used if the import cannot be resolved
+    for name, fallback in fallbacks.items():
+      symbol = self.symbols[name]
+      if isinstance(symbol, _ImportedSymbol) and symbol is not fallback:
+        symbol.fallback = fallback
+
+  visit_TryStar = visit_Try
 
   # `import xxx as yyy` only import modules
 
   def visit_ImportFrom(self, node):
-    module = node.module or ''
+    module = import_utils.resolve_relative_import(
+        self._module_name,
+        node.module,
+        level=node.level,
+        is_package=self._is_package,
+    )
     for alias in node.names:
       alias_name = alias.asname or alias.name
-      self.symbols[alias_name] = _ImportedSymbol(
+      symbol = _ImportedSymbol(
           module_name=self._module_name,
           start=node.lineno,
           end=node.end_lineno,
           import_module_name=module,
           symbol_name=alias.name,
       )
+      self.symbols[alias_name] = symbol
+      if alias.name == '*':
+        self.star_imports.append(symbol)
     self.generic_visit(node)
 
   def visit_FunctionDef(self, node: ast.FunctionDef):
     self.symbols[node.name] = _DeclaredSymbol(
         module_name=self._module_name,
-        start=node.lineno,
+        start=_definition_start(node),
         end=node.end_lineno,
     )
     # Do not recurse inside function
@@ -235,10 +298,22 @@ class _GlobalAssignementExtractor(ast.NodeVisitor):
     return super().generic_visit(node)
 
 
+def _literal_names(node: ast.expr) -> list[str] | None:
+  """Returns the `['a', 'b']` / `('a', 'b')` names (`None` if dynamic)."""
+  try:
+    names = ast.literal_eval(node)
+  except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+    return None  # Not a literal (e.g. `['a', *other]`, `{['a']}`)
+  if not isinstance(names, (list, tuple)) or not all(
+      isinstance(n, str) for n in names
+  ):
+    return None
+  return list(names)
+
+
 @functools.cache
 def extract_symbols(module_name: str) -> dict[str, _SymbolDefinition]:
-  path = import_utils.module_path(module_name)
-  return _extract_assignement_lines(path.read_text(), module_name)
+  return module_source(module_name).symbols
 
 
 @functools.cache
@@ -246,22 +321,335 @@ def extract_last_symbol(
     module_name: str, name: str
 ) -> _SymbolDefinition | None:
   try:
-    symbols = extract_symbols(module_name)
+    symbol = _find_symbol(module_name, name)
   except Exception as e:
     epy.reraise(e, prefix=f'{module_name}:{name}: ')
-  if name not in symbols:
+  if symbol is None:
     return
-  symbol = symbols[name]
   symbol = symbol.last_project_symbol
   return symbol
 
 
-def _extract_assignement_lines(
-    file_content: str,
+def extract_module_index(
+    module_names: Iterable[str],
+) -> dict[str, dict[str, _SymbolDefinition]]:
+  """Bulk version of `extract_last_symbol`, for all symbols of the modules.
+
+  Re-exports are resolved to their last project definition. The resolution
+  of each `(module, name)` hop is shared across all the symbols, so resolving
+  a large re-export graph is linear in the number of hops.
+
+  Args:
+    module_names: Modules to index
+
+  Returns:
+    The mapping `module_name` -> `name` -> definition. Names exported with
+    `__all__` are included, symbols which cannot be resolved are skipped.
+  """
+  index = {}
+  for module_name in module_names:
+    source = module_source(module_name)
+    names = [n for n in source.symbols if n != '*']
+    names.extend(n for n in source.all_names or () if n not in source.symbols)
+    symbols = {}
+    for name in names:
+      symbol = _find_symbol(module_name, name)
+      if symbol is None:
+        continue
+      try:
+        symbols[name] = symbol.last_project_symbol
+      except ValueError:  # Unresolved (e.g. missing symbol)
+        continue
+    index[module_name] = symbols
+  return index
+
+
+def _find_symbol(module_name: str, name: str) -> _SymbolDefinition | None:
+  """Returns the symbol of the module, including the `import *` ones."""
+  return _find_symbol_in(module_name, name, visited=set())
+
+
+def _find_symbol_in(
     module_name: str,
-) -> dict[str, _SymbolDefinition]:
-  tree = ast.parse(file_content)
+    name: str,
+    *,
+    visited: set[str],
+) -> _SymbolDefinition | None:
+  source = module_source(module_name)
+  if name in source.symbols:
+    return source.symbols[name]
+  visited.add(module_name)
+  # Last `import *` has priority
+  for star in reversed(source.star_imports):
+    star_module = star.import_module_name
+    if star_module in visited or not _is_project_source(star_module):
+      continue
+    star_source = module_source(star_module)
+    if star_source.all_names is not None:
+      if name not in star_source.all_names:
+        continue
+    elif name.startswith('_'):
+      continue
+    if _find_symbol_in(star_module, name, visited=visited) is not None:
+      return dataclasses.replace(star, symbol_name=name)
+  return None
+
+
+@functools.cache
+def _is_project_source(module_name: str) -> bool:
+  try:
+    # `find_spec` never import the module (`repo_relative_path` might)
+    if import_utils.find_spec(module_name) is None:
+      return False
+    return import_utils.repo_relative_path(module_name) is not None
+  except (ImportError, ValueError):
+    return False
+
+
+def _is_missing(module_name: str) -> bool:
+  """Returns `True` if the module is not installed."""
+  try:
+    return import_utils.find_spec(module_name) is None
+  except (ImportError, ValueError):
+    return True
+
+
+# Resolved `(module_name, name)` -> last project symbol
+_LAST_PROJECT_SYMBOLS: dict[tuple[str, str], _SymbolDefinition] = {}
+# Re-exports which could not be resolved: `(module_name, name)` -> reason
+_UNRESOLVED_SYMBOLS: dict[tuple[str, str], str] = {}
+
 
-  extractor = _GlobalAssignementExtractor(module_name=module_name)
+def _resolve_last_project_symbol(
+    symbol: _ImportedSymbol,
+) -> _SymbolDefinition:
+  """Follow the re-exports chain (iteratively) until the last project symbol.
+
+  Each hop of the chain is memoized, so chains sharing hops are only resolved
+  once. If the chain cannot be resolved (cycle, missing symbol), the last
+  resolved symbol is returned and the error is reported in
+  `unresolved_summary`.
+
+  Args:
+    symbol: The imported symbol
+
+  Returns:
+    The last symbol of the chain which belongs to the project.
+  """
+  chain = []
+  visited = set()
+  while True:
+    if not symbol.belong_to_project:
+      raise ValueError(f'{symbol.module_name} is not part of the project.')
+    if not isinstance(symbol, _ImportedSymbol):
+      result = symbol
+      break
+    # No need to load the child if it do not belong to the module
+    if not _is_project_source(symbol.import_module_name):
+      if symbol.fallback is not None and _is_missing(symbol.import_module_name):
+        symbol = symbol.fallback  # `except ImportError:` branch
+        continue
+      result = symbol
+      break
+    key = (symbol.import_module_name, symbol.symbol_name)
+    if key in _LAST_PROJECT_SYMBOLS:
+      result = _LAST_PROJECT_SYMBOLS[key]
+      break
+    if key in visited:
+      _UNRESOLVED_SYMBOLS[key] = 'circular re-export'
+      result = symbol
+      break
+    visited.add(key)
+    if _is_project_source(f'{key[0]}.{key[1]}'):
+      # `from pkg import submodule` is not a re-export
+      result = symbol
+      break
+    sub = _find_symbol(*key)
+    if sub is None:
+      _UNRESOLVED_SYMBOLS[key] = 'not found'
+      result = symbol
+      break
+    chain.append(key)
+    symbol = sub
+  for key in chain:
+    _LAST_PROJECT_SYMBOLS[key] = result
+  return result
+
+
+def unresolved_symbols() -> dict[tuple[str, str], str]:
+  """Returns the re-exports which could not be resolved (and why)."""
+  return dict(_UNRESOLVED_SYMBOLS)
+
+
+def add_unresolved_symbols(unresolved: dict[tuple[str, str], str]) -> None:
+  """Merge the symbols returned by `unresolved_symbols` (e.g. from workers)."""
+  _UNRESOLVED_SYMBOLS.update(unresolved)
+
+
+def unresolved_summary() -> str:
+  """Summary of all the unresolved re-exports (empty if none)."""
+  if not _UNRESOLVED_SYMBOLS:
+    return ''
+  lines = [f'{len(_UNRESOLVED_SYMBOLS)} re-exports could not be resolved:']
+  for (module_name, name), reason in sorted(_UNRESOLVED_SYMBOLS.items()):
+    lines.append(f' * `{name}` in `{module_name}`: {reason}')
+  return '\n'.join(lines)
+
+
+def _extract_assignement_lines(
+    tree: ast.Module,
+    module_name: str,
+    *,
+    is_package: bool,
+) -> _GlobalAssignementExtractor:
+  extractor = _GlobalAssignementExtractor(
+      module_name=module_name, is_package=is_package
+  )
   extractor.visit(tree)
-  return extractor.symbols
+  return extractor
+
+
+_Definition = ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef
+
+
+def _definition_start(node: _Definition) -> int:
+  """First line of the definition, including the decorators."""
+  return min([node.lineno, *(d.lineno for d in node.decorator_list)])
+
+
+def _extract_definitions(
+    tree: ast.Module,
+) -> dict[str, list[tuple[int, int]]]:
+  """Extract the line spans of all classes and functions.
+
+  Methods and nested classes are indexed by their `__qualname__` (e.g.
+  `MyClass.Nested.method`). Functions defined inside functions are skipped.
+  Conditional definitions (`if`, `try`,...) are included.
+
+  Args:
+    tree: The module AST
+
+  Returns:
+    The mapping `qualname` -> `[(start, end)]` (multiple spans if the name is
+    re-defined, like `@property` setters or `@typing.overload`), in definition
+    order.
+  """
+  definitions = collections.defaultdict(list)
+  stack = [(tree.body, '')]
+  while stack:
+    body, prefix = stack.pop()
+    for node in body:
+      if isinstance(node, _Definition):
+        qualname = f'{prefix}{node.name}'
+        span = (_definition_start(node), node.end_lineno)
+        definitions[qualname].append(span)
+        if isinstance(node, ast.ClassDef):
+          stack.append((node.body, f'{qualname}.'))
+      else:  # `if`, `try`, `with`,... blocks
+        stack.append((
+            [
+                n
+                for n in ast.iter_child_nodes(node)
+                if isinstance(n, (ast.stmt, ast.excepthandler, ast.match_case))
+            ],
+            prefix,
+        ))
+  for spans in definitions.values():
+    spans.sort()
+  return dict(definitions)
+
+
+@dataclasses.dataclass(frozen=True)
+class _ModuleTables:
+  """Tables extracted from the module AST (persisted across builds)."""
+
+  imports: list[ImportAlias]
+  symbols: dict[str, _SymbolDefinition]
+  star_imports: list[_ImportedSymbol]
+  all_names: list[str] | None
+  definitions: dict[str, list[tuple[int, int]]]
+
+
+class ModuleSource:
+  """Source of a module.
+
+  The file is read and parsed once, then shared by all the lookups (imports,
+  assignments, lines,...).
+  """
+
+  def __init__(self, module_name: str, path: pathlib.Path):
+    self.module_name = module_name
+    self.path = path
+
+  @functools.cached_property
+  def text(self) -> str:
+    return self.path.read_text()
+
+  @functools.cached_property
+  def lines(self) -> list[str]:
+    return self.text.split('\n')
+
+  @functools.cached_property
+  def tree(self) -> ast.Module:
+    profile_utils.count('ast_parse')
+    with profile_utils.timed('ast_parse', module=self.module_name):
+      return ast.parse(self.text)
+
+  @functools.cached_property
+  def _tables(self) -> _ModuleTables:
+    # Cached across builds, so unchanged files are not re-parsed. The tables
+    # depend on the module name (e.g. resolved relative imports).
+    return cache_utils.cached_for_file(
+        'module_tables',
+        self.path,
+        self._compute_tables,
+        key=self.module_name,
+    )
+
+  def _compute_tables(self) -> _ModuleTables:
+    extractor = _extract_assignement_lines(
+        self.tree,
+        self.module_name,
+        is_package=self.path.name == '__init__.py',
+    )
+    return _ModuleTables(
+        imports=_parse_global_imports(self.tree),
+        symbols=extractor.symbols,
+        star_imports=extractor.star_imports,
+        all_names=extractor.all_names,
+        definitions=_extract_definitions(self.tree),
+    )
+
+  @property
+  def imports(self) -> list[ImportAlias]:
+    """Global imports."""
+    return self._tables.imports
+
+  @property
+  def symbols(self) -> dict[str, _SymbolDefinition]:
+    """Global symbols (assignments, imports, functions, classes)."""
+    return self._tables.symbols
+
+  @property
+  def star_imports(self) -> list[_ImportedSymbol]:
+    """`from xxx import *` statements."""
+    return self._tables.star_imports
+
+  @property
+  def all_names(self) -> list[str] | None:
+    """Statically known `__all__` (`None` if not defined or dynamic)."""
+    return self._tables.all_names
+
+  @property
+  def definitions(self) -> dict[str, list[tuple[int, int]]]:
+    """Line spans of the classes, functions and methods, by qualname."""
+    return self._tables.definitions
+
+
+@functools.cache
+def module_source(module_name: str) -> ModuleSource:
+  """Returns the source of the module (shared across all calls)."""
+  return ModuleSource(
+      module_name=module_name,
+      path=import_utils.module_path(module_name),
+  )
@@ -81,3 +81,139 @@ def test_extract_assigment_lines():
       'c': 12,
       'inside_cm': 17,
   }
+
+
+def test_extract_module_index(make_package):
+  make_package(
+      'apitree_index_pkg',
+      {
+          '__init__.py': """
+              from apitree_index_pkg.a import *
+              from apitree_index_pkg.b import fn as fn_alias
+
+              try:
+                from apitree_index_pkg.b import fast
+              except ImportError:
+                fast = None
+
+              if (walrus := 1):
+                pass
+              """,
+          'a.py': """
+              from apitree_index_pkg.b import *
+
+              __all__ = ['A', 'fn']
+              __all__ += ['from_b']
+
+              A = 1
+              B = 2
+              """,
+          'b.py': """
+              def fn():
+                pass
+
+              fast = 1
+              from_b = 2
+              _private = 3
+              """,
+          'c.py': """
+              __all__ = ['c', {['unhashable']}]
+              __all__ += [(aug_walrus := 'c')]
+
+              c = 1
+              """,
+      },
+  )
+  index = ast_utils.extract_module_index(
+      ['apitree_index_pkg', 'apitree_index_pkg.a', 'apitree_index_pkg.c']
+  )
+  lines = {
+      module_name: {
+          name: (s.module_name.rpartition('.')[-1], s.start)
+          for name, s in symbols.items()
+      }
+      for module_name, symbols in index.items()
+  }
+  assert lines == {
+      'apitree_index_pkg': {
+          'fn_alias': ('b', 2),
+          'fast': ('b', 5),  # `try:` branch has priority
+          'walrus': ('apitree_index_pkg', 10),
+      },
+      'apitree_index_pkg.a': {
+          '__all__': ('a', 4),
+          'A': ('a', 7),
+          'B': ('a', 8),
+          'fn': ('b', 2),  # From `import *` (in `__all__`)
+          'from_b': ('b', 6),
+      },
+      # Non-literal `__all__` are ignored, walrus in `+=` are extracted
+      'apitree_index_pkg.c': {
+          '__all__': ('c', 2),
+          'aug_walrus': ('c', 3),
+          'c': ('c', 5),
+      },
+  }
+  # Names re-exported by `import *` are resolved
+  symbol = ast_utils.extract_last_symbol('apitree_index_pkg', 'from_b')
+  assert (symbol.module_name, symbol.start) == ('apitree_index_pkg.b', 6)
+  assert ast_utils.extract_last_symbol('apitree_index_pkg', 'B') is None
+  assert ast_utils.extract_last_symbol('apitree_index_pkg', '_private') is None
+
+
+def test_resolve_optional_dependency(make_package):
+  make_package(
+      'apitree_optional_pkg',
+      {
+          '__init__.py': """
+              try:
+                from apitree_not_installed_module import x
+              except ImportError:
+                x = None
+              """,
+      },
+  )
+  # The import cannot be resolved, so the `except ImportError:` branch is used
+  symbol = ast_utils.extract_last_symbol('apitree_optional_pkg', 'x')
+  assert (symbol.module_name, symbol.start) == ('apitree_optional_pkg', 5)
+
+
+def test_resolve_reexports(make_package, monkeypatch):
+  monkeypatch.setattr(ast_utils, '_UNRESOLVED_SYMBOLS', {})
+  make_package(
+      'apitree_facade_pkg',
+      {
+          '__init__.py': """
+              from . import api
+              from .api import x
+              from .api import missing
+              from .cycle_a import c
+              """,
+          'api.py': 'from ._src.impl import x',
+          '_src/__init__.py': '',
+          '_src/impl.py': 'x = 1',
+          'cycle_a.py': 'from .cycle_b import c',
+          'cycle_b.py': 'from .cycle_a import c',
+      },
+  )
+
+  def resolve(name):
+    symbol = ast_utils.extract_last_symbol('apitree_facade_pkg', name)
+    return (symbol.module_name, symbol.start)
+
+  # Relative imports are resolved through the facade modules
+  assert resolve('x') == ('apitree_facade_pkg._src.impl', 1)
+  # Submodules are not re-exports
+  assert resolve('api') == ('apitree_facade_pkg', 2)
+  # Unresolved chains stop at the last resolved symbol and are reported
+  assert resolve('missing') == ('apitree_facade_pkg', 4)
+  # `cycle_a.c` -> `cycle_b.c` -> `cycle_a.c`
+  assert resolve('c') == ('apitree_facade_pkg.cycle_b', 1)
+  assert ast_utils._UNRESOLVED_SYMBOLS[('apitree_facade_pkg.cycle_a', 'c')] == (
+      'circular re-export'
+  )
+  assert ast_utils.unresolved_summary() == '\n'.join([
+      '2 re-exports could not be resolved:',
+      ' * `missing` in `apitree_facade_pkg.api`: not found',
+      ' * `c` in `apitree_facade_pkg.cycle_a`: circular re-export',
+  ])
@@ -0,0 +1,275 @@
+"""Benchmark of apitree on synthetic packages.
+
+Generate a package of configurable size, then measure each phase of the API
+generation separately (import, tree extraction, classification, AST
+extraction, rendering, writing, `auto_ref` resolution).
+
+Usage:
+
+```sh
+python -m apitree.benchmark --num_modules=20 --depth=3 --output=bench.json
+```
+
+Results are saved as JSON, so they can be compared between releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import pathlib
+import platform
+import sys
+import tempfile
+import textwrap
+import time
+from typing import Any
+
+from docutils import nodes
+
+import apitree
+from apitree import context, profile_utils, structs, writer
+from apitree.ext import auto_ref
+
+
+@dataclasses.dataclass(frozen=True)
+class PackageSpec:
+  """Shape of the synthetic package.
+
+  Attributes:
+    name: Name of the package. Should be unique across the benchmarks of a
+      process (imported modules are cached).
+    num_modules: Number of modules per (sub-)package
+    depth: Number of nested sub-packages
+    num_classes: Number of classes per module
+    num_methods: Number of methods per class
+    num_functions: Number of functions per module
+    num_attributes: Number of attributes per module
+    reexports: If `True`, the packages re-export all the symbols of their
+      modules (`from .mod0 import *`)
+    lazy_imports: If `True`, the packages imports are lazy (with
+      `epy.lazy_api_imports`)
+  """
+
+  name: str = 'apitree_benchmark_pkg'
+  num_modules: int = 10
+  depth: int = 2
+  num_classes: int = 10
+  num_methods: int = 10
+  num_functions: int = 10
+  num_attributes: int = 10
+  reexports: bool = True
+  lazy_imports: bool = False
+
+
+def make_package(spec: PackageSpec, root_dir: pathlib.Path) -> pathlib.Path:
+  """Write the synthetic package inside `root_dir`.
+
+  Args:
+    spec: Shape of the package
+    root_dir: Directory in which write the package (should be added to
+      `sys.path` to import the package)
+
+  Returns:
+    The package directory.
+  """
+  pkg_dir = root_dir / spec.name
+  for level in range(spec.depth + 1):
+    _write_package(spec, pkg_dir.joinpath(*['sub'] * level), level=level)
+  return pkg_dir
+
+
+def _write_package(spec: PackageSpec, path: pathlib.Path, *, level: int):
+  path.mkdir(parents=True, exist_ok=True)
+  module_names = [f'mod{i}' for i in range(spec.num_modules)]
+  for module_name in module_names:
+    (path / f'{module_name}.py').write_text(_module_source(spec, module_name))
+
+  if spec.lazy_imports:
+    # Lazy imports only support absolute imports and explicit names
+    package_name = '.'.join([spec.name, *['sub'] * level])
+    lines = [f'from {package_name} import {name}' for name in module_names]
+    if level < spec.depth:
+      lines.append(f'from {package_name} import sub')
+    if spec.reexports:
+      lines.extend(
+          f'from {package_name}.{module_name} import {name}'
+          for module_name in module_names
+          for name in _symbol_names(spec, module_name)
+      )
+    lines = [
+        'from etils import epy',
+        '',
+        'with epy.lazy_api_imports(globals()):',
+        *(f'  {line}' for line in lines),
+    ]
+  else:
+    lines = [f'from . import {name}' for name in module_names]
+    if level < spec.depth:
+      lines.append('from . import sub')
+    if spec.reexports:
+      lines.extend(f'from .{name} import *' for name in module_names)
+  (path / '__init__.py').write_text('\n'.join(lines) + '\n')
+
+
+def _class_name(module_name: str, i: int) -> str:
+  return f'{module_name.capitalize()}Class{i}'
+
+
+def _function_name(module_name: str, i: int) -> str:
+  return f'{module_name}_fn{i}'
+
+
+def _attribute_name(module_name: str, i: int) -> str:
+  return f'{module_name.upper()}_ATTR{i}'
+
+
+def _symbol_names(spec: PackageSpec, module_name: str) -> list[str]:
+  """Public symbols of the module (its `__all__`)."""
+  return [
+      *(_class_name(module_name, i) for i in range(spec.num_classes)),
+      *(_function_name(module_name, i) for i in range(spec.num_functions)),
+      *(_attribute_name(module_name, i) for i in range(spec.num_attributes)),
+  ]
+
+
+def _module_source(spec: PackageSpec, module_name: str) -> str:
+  """Source of a module, with classes, functions and attributes."""
+  names = []
+  parts = [f'"""Module {module_name}."""']
+  for i in range(spec.num_classes):
+    names.append(_class_name(module_name, i))
+    methods = ''.join(
+        f'\n  def method{j}(self, x: int) -> int:\n'
+        f'    """Method {j}."""\n'
+        '    return x\n'
+        for j in range(spec.num_methods)
+    )
+    parts.append(
+        f'class {names[-1]}:\n  """Class {i} of {module_name}."""\n{methods}'
+    )
+  for i in range(spec.num_functions):
+    names.append(_function_name(module_name, i))
+    parts.append(textwrap.dedent(f'''\
+        def {names[-1]}(x: int) -> int:
+          """Function {i} of {module_name}."""
+          return x
+        '''))
+  for i in range(spec.num_attributes):
+    names.append(_attribute_name(module_name, i))
+    parts.append(f'# Attribute {i}.\n{names[-1]}: int = {i}')
+  parts.append(f'__all__ = {names!r}')
+  return '\n\n'.join(parts) + '\n'
+
+
+def run(
+    spec: PackageSpec,
+    *,
+    work_dir: pathlib.Path | None = None,
+) -> dict[str, Any]:
+  """Generate the package and measure the API generation.
+
+  Args:
+    spec: Shape of the package
+    work_dir: Where to write the package and the API pages (default to a
+      temporary directory)
+
+  Returns:
+    The results (timings per phase, counters,...), JSON serializable.
+  """
+  if work_dir is None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      return run(spec, work_dir=pathlib.Path(tmp_dir))
+
+  make_package(spec, work_dir)
+  sys.path.insert(0, os.fspath(work_dir))
+  context.ctx.refs = []
+  context.ctx.ref_index = None
+  profiler = profile_utils.profiler
+  enabled, output = profiler.enabled, profiler.output
+  profiler.reset()
+  profile_utils.enable()
+  try:
+    info = structs.ModuleInfo(
+        api=spec.name,
+        github_url='https://github.com/apitree/benchmark',
+        path_rel_to_imports=True,
+        # Do not resolve the lazy imports of the undocumented symbols
+        lazy_values=spec.lazy_imports,
+    )
+    start = time.perf_counter()
+    files = writer.write_doc(info, root_dir=work_dir / 'api', verbose=False)
+    doctree = _make_doctree()
+    with profile_utils.timed('auto_ref'):
+      auto_ref._add_refs(  # pylint: disable=protected-access
+          None, doctree, 'guide/intro'
+      )
+    num_refs = len(list(doctree.findall(nodes.reference)))
+    total = time.perf_counter() - start
+    report = profiler.as_json()
+  finally:
+    # Restore the user profiling (e.g. `APITREE_PROFILE`)
+    profiler.enabled, profiler.output = enabled, output
+    profiler.reset()
+    sys.path.remove(os.fspath(work_dir))
+
+  return {
+      'apitree_version': apitree.__version__,
+      'python_version': platform.python_version(),
+      'spec': dataclasses.asdict(spec),
+      'total': total,
+      'num_pages': len(files),
+      'num_auto_refs': num_refs,
+      'phases': {k: v['total'] for k, v in report['phases'].items()},
+      'counters': report['counters'],
+  }
+
+
+def _make_doctree() -> nodes.document:
+  """Page referencing all the symbols (and as many unknown names)."""
+  names = sorted({ref.name for ref in context.ctx.refs})
+  doctree = nodes.document(None, None)
+  # One paragraph per symbol (like real pages), as docutils replaces the
+  # nodes in linear time of the number of siblings
+  for name in names:
+    paragraph = nodes.paragraph()
+    paragraph += nodes.literal(text=name)
+    paragraph += nodes.Text(' and ')
+    paragraph += nodes.literal(text=f'{name}_unknown')
+    doctree += paragraph
+  return doctree
+
+
+def _parse_args() -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+  for field in dataclasses.fields(PackageSpec):
+    if field.type == 'bool':
+      parser.add_argument(
+          f'--{field.name}',
+          default=field.default,
+          action=argparse.BooleanOptionalAction,
+      )
+    else:
+      parser.add_argument(
+          f'--{field.name}',
+          default=field.default,
+          type=str if field.type == 'str' else int,
+      )
+  parser.add_argument('--output', help='Where to save the JSON results.')
+  return parser.parse_args()
+
+
+def main() -> None:
+  args = vars(_parse_args())
+  output = args.pop('output')
+  results = run(PackageSpec(**args))
+  content = json.dumps(results, indent=2)
+  if output:
+    pathlib.Path(output).write_text(content)
+  print(content)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,38 @@
+import dataclasses
+import json
+
+from apitree import benchmark, profile_utils
+
+
+def test_benchmark(tmp_path, monkeypatch):
+  # The user profiling is restored after the benchmark
+  monkeypatch.setattr(profile_utils.profiler, 'enabled', True)
+
+  spec = benchmark.PackageSpec(
+      name='apitree_benchmark_test_pkg',
+      num_modules=2,
+      depth=1,
+      num_classes=2,
+      num_methods=2,
+      num_functions=2,
+      num_attributes=2,
+  )
+  results = benchmark.run(spec, work_dir=tmp_path)
+  json.dumps(results)  # Results are serializable
+
+  assert results['spec'] == dataclasses.asdict(spec)
+  # 2 packages, each with: index + 2 modules * (index + 6 symbols) + 2 * 6
+  # re-exported symbols, and the search index
+  assert results['num_pages'] == 2 * (1 + 2 * 7 + 2 * 6) + 1
+  assert results['num_auto_refs'] > 0
+  for phase in (
+      'import',
+      'extract',
+      'classification',
+      'ast_parse',
+      'render',
+      'write',
+      'auto_ref',
+  ):
+    assert phase in results['phases']
+  assert profile_utils.profiler.enabled
@@ -0,0 +1,126 @@
+"""Persistent on-disk cache, to reuse results across Sphinx builds."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from apitree import context, profile_utils
+
+_T = TypeVar('_T')
+
+# Increase the version every time the format of the cached values change
+# (e.g. `ast_utils._SymbolDefinition` fields updated).
+_CACHE_VERSION = 9
+
+
+def cached_for_file(
+    namespace: str,
+    path: pathlib.Path,
+    compute_fn: Callable[[], _T],
+    *,
+    key: str = '',
+) -> _T:
+  """Returns the cached value computed from the file `path`.
+
+  The cache is invalidated when the file is updated (based on the mtime, size
+  and content hash).
+
+  Args:
+    namespace: Name of the cache (e.g. `symbols`)
+    path: File from which the value is computed
+    compute_fn: Compute the value (called if the cache is missing or outdated)
+    key: Additional inputs the value depends on (e.g. the module name, as the
+      same file can be imported under different names)
+
+  Returns:
+    The value
+  """
+  cache_dir = context.ctx.cache_dir
+  if cache_dir is None:  # Cache disabled
+    return compute_fn()
+
+  path = pathlib.Path(path)
+  stat = path.stat()
+  cache_path = _cache_path(cache_dir, namespace, path, key=key)
+
+  entry = _load(cache_path)
+  if (
+      entry is not None
+      and entry['path'] == os.fspath(path)
+      and entry['key'] == key
+  ):
+    if (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+      profile_utils.count(f'cache_hits.{namespace}')
+      return entry['value']
+    # The file was touched, but the content might be identical (e.g. after a
+    # `git checkout`)
+    if entry['size'] == stat.st_size and entry['hash'] == _hash(path):
+      _save(cache_path, {**entry, 'mtime_ns': stat.st_mtime_ns})
+      profile_utils.count(f'cache_hits.{namespace}')
+      return entry['value']
+
+  profile_utils.count(f'cache_misses.{namespace}')
+  value = compute_fn()
+  _save(
+      cache_path,
+      {
+          'version': _CACHE_VERSION,
+          'path': os.fspath(path),
+          'key': key,
+          'mtime_ns': stat.st_mtime_ns,
+          'size': stat.st_size,
+          'hash': _hash(path),
+          'value': value,
+      },
+  )
+  return value
+
+
+def _cache_path(
+    cache_dir: pathlib.Path,
+    namespace: str,
+    path: pathlib.Path,
+    *,
+    key: str,
+) -> pathlib.Path:
+  digest = hashlib.sha1(f'{os.fspath(path)}:{key}'.encode()).hexdigest()
+  return pathlib.Path(cache_dir) / namespace / f'{path.stem}-{digest}.pkl'
+
+
+def _hash(path: pathlib.Path) -> str:
+  return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _load(cache_path: pathlib.Path) -> dict[str, Any] | None:
+  try:
+    entry = pickle.loads(cache_path.read_bytes())
+  except Exception:  # pylint: disable=broad-except
+    return None  # Missing or corrupted cache
+  if not isinstance(entry, dict) or entry.get('version') != _CACHE_VERSION:
+    return None
+  return entry
+
+
+def _save(cache_path: pathlib.Path, entry: dict[str, Any]) -> None:
+  """Save the entry (best-effort, like `_load`)."""
+  tmp_path = None
+  try:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write atomically, so concurrent builds never read partial files. The
+    # temporary file is unique, as threads might save the same entry.
+    with tempfile.NamedTemporaryFile(
+        dir=cache_path.parent, suffix='.tmp', delete=False
+    ) as f:
+      tmp_path = pathlib.Path(f.name)
+      f.write(pickle.dumps(entry))
+    os.replace(tmp_path, cache_path)
+  except OSError:
+    profile_utils.count('cache_save_errors')  # E.g. read-only or full disk
+    if tmp_path is not None:
+      tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,80 @@
+import concurrent.futures
+import os
+import threading
+
+from apitree import cache_utils, context
+
+
+def test_cached_for_file(tmp_path, monkeypatch):
+  monkeypatch.setattr(context.ctx, 'cache_dir', tmp_path / 'cache')
+
+  path = tmp_path / 'module.py'
+  path.write_text('x = 1')
+
+  calls = []
+
+  def compute():
+    calls.append(path.read_text())
+    return len(calls)
+
+  assert cache_utils.cached_for_file('symbols', path, compute) == 1
+  assert cache_utils.cached_for_file('symbols', path, compute) == 1
+
+  # Touching the file without changing the content re-use the cache
+  os.utime(path, ns=(0, 0))
+  assert cache_utils.cached_for_file('symbols', path, compute) == 1
+
+  # Updating the file invalidate the cache
+  path.write_text('x = 2')
+  assert cache_utils.cached_for_file('symbols', path, compute) == 2
+  assert calls == ['x = 1', 'x = 2']
+
+  # Values depending on other inputs (e.g. the module name) are cached
+  # separately
+  assert cache_utils.cached_for_file('symbols', path, compute, key='a') == 3
+  assert cache_utils.cached_for_file('symbols', path, compute, key='b') == 4
+  assert cache_utils.cached_for_file('symbols', path, compute, key='a') == 3
+
+
+def test_cache_disabled(tmp_path, monkeypatch):
+  monkeypatch.setattr(context.ctx, 'cache_dir', None)
+
+  path = tmp_path / 'module.py'
+  path.write_text('x = 1')
+  assert cache_utils.cached_for_file('symbols', path, lambda: 1) == 1
+  assert cache_utils.cached_for_file('symbols', path, lambda: 2) == 2
+
+
+def test_cache_concurrent_saves(tmp_path, monkeypatch):
+  cache_dir = tmp_path / 'cache'
+  monkeypatch.setattr(context.ctx, 'cache_dir', cache_dir)
+
+  path = tmp_path / 'module.py'
+  path.write_text('x = 1')
+
+  num_threads = 8
+  barrier = threading.Barrier(num_threads)
+
+  def compute():
+    barrier.wait()  # All threads miss the cache and save the same entry
+    return 1
+
+  with concurrent.futures.ThreadPoolExecutor(num_threads) as executor:
+    futures = [
+        executor.submit(cache_utils.cached_for_file, 'symbols', path, compute)
+        for _ in range(num_threads)
+    ]
+  assert [f.result() for f in futures] == [1] * num_threads
+  # No temporary files left
+  assert [p.suffix for p in (cache_dir / 'symbols').iterdir()] == ['.pkl']
+
+
+def test_cache_unwritable(tmp_path, monkeypatch):
+  cache_dir = tmp_path / 'cache'
+  cache_dir.write_text('')  # Not a directory
+  monkeypatch.setattr(context.ctx, 'cache_dir', cache_dir)
+
+  path = tmp_path / 'module.py'
+  path.write_text('x = 1')
+  # Saving is best-effort
+  assert cache_utils.cached_for_file('symbols', path, lambda: 1) == 1
@@ -1,3 +1,4 @@
+import concurrent.futures
 import functools
 import os
 import pathlib
@@ -8,13 +9,29 @@ from typing import Any
 import sphinx
 from etils import epath, epy
 
-from apitree import import_utils, structs, writer
+from apitree import (
+    ast_utils,
+    context,
+    import_utils,
+    profile_utils,
+    ref_index,
+    structs,
+    writer,
+)
 from apitree.ext import github_link
 
 
-def setup(app, *, callbacks):
+def setup(app, *, callbacks, api_dir=None):
   for callback in callbacks:
     callback()
+  if api_dir is not None:
+    app.connect(
+        'build-finished',
+        functools.partial(_copy_search_indexes, api_dir=api_dir),
+    )
+  app.connect('build-finished', _report_unresolved_symbols)
+  if profile_utils.profiler.enabled:
+    app.connect('build-finished', _report_profile)
 
 
 def make_project(
@@ -22,6 +39,11 @@ def make_project(
     modules: dict[str, str] | structs.ModuleInfo | list[structs.ModuleInfo],
     includes_paths: dict[str, str] = {},
     redirects: dict[str, str] = {},
+    incremental: bool = True,
+    num_workers: int | None = None,
+    num_processes: int | None = None,
+    cache_dir: str | os.PathLike[str] | None = '_build/.apitree_cache',
+    profile: bool | str | os.PathLike[str] = False,
     globals: dict[str, Any],
 ) -> None:
   """Setup the `conf.py`.
@@ -31,6 +53,19 @@ def make_project(
     includes_paths: Mapping to external files to `docs/` path (e.g.
       `my_module/submodule/README.md` to `submodule.md`). By default, only
       files inside `docs/...` can be read
+    incremental: If `True`, only the API pages which changed are re-written
+      (unchanged pages keep their mtime, so Sphinx do not re-read them).
+      Otherwise, `docs/api/` is deleted and re-generated at each build.
+    num_workers: Number of threads used to render and write the API pages
+      (default to sequential).
+    num_processes: If set, each of the `modules` is imported and documented
+      in a separate process (useful when there are multiple heavy modules).
+    cache_dir: Where to persist the parsed source files across builds
+      (relative to `docs/`). `None` to disable the cache.
+    profile: If `True`, print the timings of the apitree build phases at the
+      end of the build. Can also be a path (relative to `docs/`) where to save
+      the report as JSON. Can also be set with the `APITREE_PROFILE` env
+      variable.
     globals: The `conf.py` `globals()` dict. Will be mutated.
   """
 
@@ -39,6 +74,16 @@ def make_project(
 
   project_name = _get_project_name(repo_dir=repo_dir)
 
+  if cache_dir is not None:
+    context.ctx.cache_dir = docs_dir / cache_dir
+
+  if profile is True:
+    profile_utils.enable()
+  elif profile:
+    profile_utils.enable(docs_dir / profile)
+  else:
+    profile_utils.enable_from_env()
+
   # TODO(epot): Fragile if one of the module is already imported.
   # If so, should check that imported modules are
   # `import_utils.belong_to_project`
@@ -116,9 +161,15 @@ def make_project(
       # Register hooks
       setup=functools.partial(
           setup,
+          api_dir=docs_dir / 'api',
           callbacks=[
               functools.partial(
-                  _write_api_doc, docs_dir=docs_dir, modules=modules
+                  _write_api_doc,
+                  docs_dir=docs_dir,
+                  modules=modules,
+                  incremental=incremental,
+                  num_workers=num_workers,
+                  num_processes=num_processes,
               ),
               functools.partial(
                   _write_include_paths,
@@ -149,19 +200,116 @@ def _write_api_doc(
     *,
     docs_dir: pathlib.Path,
     modules: dict[str, str] | structs.ModuleInfo | list[structs.ModuleInfo],
+    incremental: bool,
+    num_workers: int | None,
+    num_processes: int | None,
 ):
   api_dir = docs_dir / 'api'
-  if api_dir.exists():
+  if api_dir.exists() and not incremental:
     api_dir.rmtree()
-  api_dir.mkdir()
+  api_dir.mkdir(exist_ok=True)
 
   if isinstance(modules, dict):
     modules = [structs.ModuleInfo(alias=k, api=v) for k, v in modules.items()]
   if isinstance(modules, structs.ModuleInfo):
     modules = [modules]
 
-  for module_info in modules:
-    writer.write_doc(module_info, root_dir=api_dir)
+  write_fn = functools.partial(
+      writer.write_doc,
+      root_dir=api_dir,
+      incremental=incremental,
+      num_workers=num_workers,
+  )
+  files = []
+  with profile_utils.timed('api_doc'):
+    files.extend(_write_modules_doc(modules, write_fn, num_processes))
+
+  if incremental:  # Remove the pages of the deleted symbols
+    writer.remove_stale_files(api_dir, files)
+
+
+def _write_modules_doc(
+    modules: list[structs.ModuleInfo],
+    write_fn,
+    num_processes: int | None,
+) -> list[epath.Path | str]:
+  files = []
+  if num_processes is None:
+    for module_info in modules:
+      files.extend(write_fn(module_info))
+  else:
+    # Each module is imported, extracted and written in a separate process.
+    # Only the references (for `auto_ref`) and the source locations (for
+    # `linkcode_resolve`) are sent back.
+    with concurrent.futures.ProcessPoolExecutor(num_processes) as executor:
+      for module_files, refs, locations, unresolved, profile in executor.map(
+          functools.partial(
+              _write_module_doc_in_worker,
+              write_fn=write_fn,
+              cache_dir=context.ctx.cache_dir,
+              profile=profile_utils.profiler.enabled,
+          ),
+          modules,
+      ):
+        files.extend(module_files)
+        context.add_refs(refs)
+        context.merge_source_locations(locations)
+        ast_utils.add_unresolved_symbols(unresolved)
+        profile_utils.profiler.merge(profile)
+    context.ctx.curr = modules[-1]
+  return files
+
+
+def _write_module_doc_in_worker(
+    module_info: structs.ModuleInfo,
+    *,
+    write_fn,
+    cache_dir: pathlib.Path | None,
+    profile: bool,
+) -> tuple[
+    list[str],
+    list[ref_index.RefCandidate],
+    dict[tuple[str, str], str],
+    dict[tuple[str, str], str],
+    dict[str, Any],
+]:
+  context.ctx.cache_dir = cache_dir
+  # Only export the refs and locations of this module (workers are re-used
+  # for multiple modules)
+  context.ctx.refs = []
+  context.ctx.ref_index = None
+  context.ctx.source_locations = {}
+  profile_utils.profiler.enabled = profile
+  profile_utils.profiler.reset()  # Only report the worker own timings
+  files = write_fn(module_info)
+  return (
+      [os.fspath(f) for f in files],
+      context.export_refs(),
+      context.export_source_locations(),
+      ast_utils.unresolved_symbols(),
+      profile_utils.profiler.as_json(),
+  )
+
+
+def _copy_search_indexes(app, exception, *, api_dir: pathlib.Path) -> None:
+  """Copy the modules `search_index.json` to the html output."""
+  if exception is not None or app.builder.format != 'html':
+    return
+  for path in epath.Path(api_dir).glob('*/search_index.json'):
+    dst = epath.Path(app.outdir) / 'api' / path.relative_to(api_dir)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    dst.write_text(path.read_text())
+
+
+def _report_unresolved_symbols(app, exception) -> None:
+  del app, exception
+  if summary := ast_utils.unresolved_summary():
+    print(summary)
+
+
+def _report_profile(app, exception) -> None:
+  del app, exception
+  profile_utils.profiler.report()
 
 
 def _write_include_paths(
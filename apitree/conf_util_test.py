@@ -0,0 +1,62 @@
+import functools
+import pathlib
+
+from etils import epath
+
+from apitree import conf_util, context, writer
+
+
+def test_write_api_doc_multi_process(tmp_path, make_package, monkeypatch):
+  monkeypatch.setattr(context.ctx, 'refs', [])
+
+  modules = [
+      make_package(
+          f'apitree_process_pkg{i}',
+          {'__init__.py': f'def my_fn{i}():\n  pass\n'},
+      )
+      for i in range(2)
+  ]
+  docs_dir = epath.Path(tmp_path / 'docs')
+  docs_dir.mkdir()
+  conf_util._write_api_doc(
+      docs_dir=docs_dir,
+      modules=modules,
+      incremental=True,
+      num_workers=None,
+      num_processes=2,
+  )
+
+  assert (docs_dir / 'api/apitree_process_pkg1/my_fn1.md').exists()
+  # References are sent back from the workers
+  assert context.get_ref('apitree_process_pkg1.my_fn1') == context.Ref(
+      qualname='apitree_process_pkg1.my_fn1',
+      filename=pathlib.Path('apitree_process_pkg1/my_fn1.md'),
+  )
+
+
+def test_write_module_doc_in_worker(tmp_path, make_package, monkeypatch):
+  monkeypatch.setattr(context.ctx, 'refs', [])
+  monkeypatch.setattr(context.ctx, 'source_locations', {})
+
+  modules = [
+      make_package(
+          f'apitree_worker_pkg{i}',
+          {'__init__.py': f'def my_fn{i}():\n  pass\n'},
+      )
+      for i in range(2)
+  ]
+  write_fn = functools.partial(
+      writer.write_doc, root_dir=epath.Path(tmp_path / 'api'), verbose=False
+  )
+  # The same worker process documents both modules
+  for module_info in modules:
+    _, refs, locations, _, _ = conf_util._write_module_doc_in_worker(
+        module_info, write_fn=write_fn, cache_dir=None, profile=False
+    )
+  # Only the last module refs and locations are exported
+  assert {ref.ref.qualname.split('.')[0] for ref in refs} == {
+      'apitree_worker_pkg1'
+  }
+  assert {module_name for module_name, _ in locations} == {
+      'apitree_worker_pkg1'
+  }
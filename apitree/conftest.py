@@ -0,0 +1,42 @@
+"""Shared test fixtures."""
+
+import os
+import sys
+import textwrap
+
+import pytest
+
+from apitree import context, structs
+
+
+@pytest.fixture
+def make_package(tmp_path, monkeypatch):
+  """Create a fake package inside `tmp_path` and make it importable.
+
+  Usage:
+
+  ```python
+  def test_xxx(make_package):
+    info = make_package('my_pkg', {'__init__.py': 'x = 1'})
+  ```
+
+  The package is set as the current module (`context.ctx.curr`). Package
+  names should be unique across tests, as imported modules are cached.
+  """
+  monkeypatch.setattr(sys, 'path', [os.fspath(tmp_path), *sys.path])
+
+  def make(name: str, files: dict[str, str], **kwargs) -> structs.ModuleInfo:
+    for filename, content in files.items():
+      path = tmp_path / name / filename
+      path.parent.mkdir(parents=True, exist_ok=True)
+      path.write_text(textwrap.dedent(content))
+    info = structs.ModuleInfo(
+        api=name,
+        github_url='https://github.com/user/repo',
+        path_rel_to_imports=True,
+        **kwargs,
+    )
+    monkeypatch.setattr(context.ctx, 'curr', info)
+    return info
+
+  return make
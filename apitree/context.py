@@ -1,43 +1,63 @@
 from __future__ import annotations
 
-import collections
 import os
+import pathlib
+import typing
 from typing import Optional
 
-from apitree import structs, tree_extractor
+from apitree import ref_index
+from apitree.ref_index import Ref
+
+if typing.TYPE_CHECKING:
+  from apitree import object_info, structs, tree_extractor
 
 
 class Context:
 
   def __init__(self):
-    self.refs: dict[str, list[tree_extractor.Node]] = collections.defaultdict(
-        list
-    )
+    # Candidates references (from all documented modules)
+    self.refs: list[ref_index.RefCandidate] = []
+    # Index built from the `refs` (lazily re-built after new refs are added)
+    self.ref_index: Optional[ref_index.RefIndex] = None
     self.curr: structs.ModuleInfo = None
+    # Persistent cache directory (`None` to disable the cache)
+    self.cache_dir: Optional[pathlib.Path] = None
+    # Per-object analysis, keyed by `id(obj)` (see `object_info.py`)
+    self.objects: dict[int, object_info.ObjectInfo] = {}
+    # `(module, fullname)` -> source location (e.g. `path.py#L10-L20`), for
+    # `linkcode_resolve`
+    self.source_locations: dict[tuple[str, str], str] = {}
 
 
-def get_ref(name: str) -> Optional[tree_extractor.Node]:
-  matches = ctx.refs.get(name)
-  if not matches:
-    return None
-  if len(matches) != 1:
-    return None
-  return matches[0]
+def get_ref(name: str) -> Optional[Ref]:
+  if ctx.ref_index is None:
+    ctx.ref_index = ref_index.RefIndex.build(ctx.refs)
+  return ctx.ref_index.resolve(name)
 
 
 def add_ref(node: tree_extractor.Node) -> None:
-  name = node.symbol.qualname
-  ctx.refs[name].append(node)
-  if '.' in name:
-    _, subname = name.rsplit('.', 1)
-    ctx.refs[subname].append(node)
-  # `qualname_no_alias` is acually the real module name.
-  # Could also add the real `qualname_no_alias`. For example:
-  # * `kd.typing.XX`  # Public symbol
-  # * `kauldron.typing.XX`  # Alias replaced
-  # * `kauldron.utils.typing.XX`  # Real module location
-  if node.symbol.qualname_no_alias != node.symbol.qualname:
-    ctx.refs[node.symbol.qualname_no_alias].append(node)
+  add_refs(ref_index.candidates_from_node(node))
+
+
+def export_refs() -> list[ref_index.RefCandidate]:
+  """Returns the references in a serializable format."""
+  return list(ctx.refs)
+
+
+def add_refs(refs: typing.Iterable[ref_index.RefCandidate]) -> None:
+  """Merge the references exported by `export_refs`."""
+  ctx.refs.extend(refs)
+  ctx.ref_index = None
+
+
+def export_source_locations() -> dict[tuple[str, str], str]:
+  """Returns the source locations index in a serializable format."""
+  return dict(ctx.source_locations)
+
+
+def merge_source_locations(locations: dict[tuple[str, str], str]) -> None:
+  """Merge the source locations exported by `export_source_locations`."""
+  ctx.source_locations.update(locations)
 
 
 ctx = Context()
@@ -3,67 +3,69 @@
 Replace all `my_module.XXX` by `:ref:...` to link to the API doc.
 
 """
-import os
-import pathlib
-import typing
+import functools
+import posixpath
 
 from docutils import nodes
 from sphinx.application import Sphinx
 
-from apitree import context, debug_utils
+from apitree import context, debug_utils, path_utils
 
 
-def _is_inside_link(node: nodes.Node):
-    while node.parent:
-        if isinstance(node.parent, nodes.reference):
-            return True
-        node = node.parent
-    return False
+def _find_literals(doctree: nodes.document) -> list[nodes.Element]:
+    """Returns all inline code not already inside a link.
 
+    The doctree is traversed once (top-down), tracking whether the current node
+    is inside a link, rather than walking up the parents for each literal.
 
-def _add_refs(app: Sphinx, doctree: nodes.document, docname: str):
-    docpath = pathlib.Path(docname + '.md')
-
-    for node in doctree.findall(lambda n: isinstance(n, (nodes.title_reference, nodes.literal))):
-        node = typing.cast(nodes.Element, node)
+    Args:
+        doctree: The document
 
-        if _is_inside_link(node):
+    Returns:
+        The literals, in document order
+    """
+    literals = []
+    stack = [(doctree, False)]
+    while stack:
+        node, inside_link = stack.pop()
+        if not isinstance(node, nodes.Element):  # Text
             continue
+        if not inside_link and isinstance(
+            node, (nodes.title_reference, nodes.literal)
+        ):
+            literals.append(node)
+        inside_link = inside_link or isinstance(node, nodes.reference)
+        stack.extend((child, inside_link) for child in reversed(node.children))
+    return literals
 
-        ref_name = node.astext()
-        ref_uri = context.get_ref(ref_name.lstrip('@'))
 
-        if ref_uri is None:
+def _add_refs(app: Sphinx, doctree: nodes.document, docname: str):
+    literals = [(node, node.astext()) for node in _find_literals(doctree)]
+
+    # Resolve all the names together
+    name_to_url = {}
+    for ref_name in {ref_name for _, ref_name in literals}:
+        ref_uri = context.get_ref(ref_name)
+        if ref_uri is not None:
+            name_to_url[ref_name] = path_utils.relative_url(
+                docname, _ref_url(ref_uri)
+            )
+
+    for node, ref_name in literals:
+        if ref_name not in name_to_url:
             continue
 
-        ref_path = pathlib.Path('api') / ref_uri.match.filename
-        ref_path = ref_path.with_suffix('.html')
-
-        ref_path = _relative_path(ref_path, docpath)
-
         # Wrap inside ref
-        ref = nodes.reference(refuri=os.fspath(ref_path))
+        ref = nodes.reference(refuri=name_to_url[ref_name])
         ref += nodes.literal(text=ref_name)
 
         node.replace_self(ref)
 
 
-def _relative_path(p0: pathlib.Path, p1: pathlib.Path) -> pathlib.Path:
-  if p0.is_relative_to(p1):
-    return p0.relative_to(p1)
-
-  # Extract the common part between the paths
-  num_common_parts = 0
-  for part0, part1 in zip(p0.parts, p1.parts):
-    if part0 != part1:
-      break
-    num_common_parts +=1
-
-  num_parents = len(p1.parts) - num_common_parts -1
-
-  new_p = pathlib.Path(*(['..'] * num_parents)).joinpath(*p0.parts[num_common_parts:])
-  return new_p
-
+@functools.lru_cache(maxsize=None)
+def _ref_url(ref: context.Ref) -> str:
+    """Url of the referenced page, relative to the `docs/` root."""
+    return posixpath.join('api', ref.filename.with_suffix('.html').as_posix())
 
 
 def setup(app: Sphinx):
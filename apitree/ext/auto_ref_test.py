@@ -0,0 +1,46 @@
+import pathlib
+
+from docutils import nodes
+
+from apitree import context, ref_index
+from apitree.ext import auto_ref
+
+
+def _make_doctree(num_paragraphs: int) -> nodes.document:
+  doctree = nodes.document(None, None)
+  section = nodes.section()
+  doctree += section
+  for i in range(num_paragraphs):
+    paragraph = nodes.paragraph()
+    paragraph += nodes.Text('Some text ')
+    paragraph += nodes.literal(text='my_fn')
+    paragraph += nodes.literal(text=f'unknown{i}')
+    link = nodes.reference(refuri='https://example.com')
+    link += nodes.strong()
+    link[0] += nodes.literal(text='my_fn')  # Already inside a link
+    paragraph += link
+    section += paragraph
+  return doctree
+
+
+def test_add_refs(monkeypatch):
+  index = ref_index.RefIndex({
+      'my_fn': ref_index.Ref(
+          qualname='pkg.my_fn', filename=pathlib.Path('pkg/my_fn.md')
+      ),
+  })
+  monkeypatch.setattr(context.ctx, 'ref_index', index)
+
+  num_paragraphs = 20_000
+  doctree = _make_doctree(num_paragraphs)
+
+  auto_ref._add_refs(None, doctree, 'guide/intro')
+
+  refs = list(doctree.findall(nodes.reference))
+  new_refs = [r for r in refs if r['refuri'] != 'https://example.com']
+  assert len(new_refs) == num_paragraphs
+  assert {r['refuri'] for r in new_refs} == {'../api/pkg/my_fn.html'}
+  assert {r.astext() for r in new_refs} == {'my_fn'}
+  # Links are not nested
+  for ref in refs:
+    assert not list(ref.findall(nodes.reference, include_self=False))
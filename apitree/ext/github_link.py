@@ -5,9 +5,16 @@ import importlib
 import inspect
 import os
 import pathlib
-import subprocess
+from typing import Any
 
-from apitree import ast_utils, context, debug_utils, import_utils
+from apitree import (
+    ast_utils,
+    context,
+    debug_utils,
+    git_utils,
+    import_utils,
+    profile_utils,
+)
 
 
 @debug_utils.print_error()
@@ -16,11 +23,20 @@ def linkcode_resolve(domain, info):
     return None
   if not info['module']:
     return None
-  return _linkcode_resolve(info['module'], info['fullname'])
+  profile_utils.count('linkcode_resolve')
+  with profile_utils.timed('linkcode_resolve', module=info['module']):
+    return _linkcode_resolve(info['module'], info['fullname'])
 
 
 def _linkcode_resolve(module_name: str, fullname: str) -> str:
-  suffix = _get_lines_suffix(module_name, fullname)
+  key = (module_name, fullname)
+  suffix = context.ctx.source_locations.get(key)
+  if suffix is None:
+    profile_utils.count('linkcode_index_misses')
+    suffix = _get_lines_suffix(module_name, fullname)
+    context.ctx.source_locations[key] = suffix
+  else:
+    profile_utils.count('linkcode_index_hits')
   if not suffix:
     if '.' in fullname:
       # Attributes are not documented (as they beloong to different files)
@@ -30,12 +46,12 @@ def _linkcode_resolve(module_name: str, fullname: str) -> str:
     if symbol is None:
       raise ValueError(f'{module_name}:{fullname} not found.')
     suffix = f'{symbol.filename}{symbol.git_lno}'
-  return f'{context.ctx.curr.github_url}/tree/main/{suffix}'
+  return _make_url(suffix)
 
 
 def get_module_link(module_name):
   path = import_utils.repo_relative_path(module_name)
-  return f'{context.ctx.curr.github_url}/tree/main/{path}'
+  return _make_url(path)
 
 
 def get_assignement_link(module_name, name):
@@ -43,8 +59,45 @@ def get_assignement_link(module_name, name):
   if symbol is None:
     raise ValueError(f'{module_name}:{name} not found.')
 
-  source_link = f'{context.ctx.curr.github_url}/tree/main/{symbol.filename}{symbol.git_lno}'
-  return source_link
+  return _make_url(f'{symbol.filename}{symbol.git_lno}')
+
+
+def _make_url(path: str) -> str:
+  info = context.ctx.curr
+  return f'{info.github_url}/tree/{info.github_ref}/{path}'
+
+
+def add_source_locations(qualname: str, obj: Any) -> None:
+  """Index the source location of the class or function (and its methods).
+
+  Called when the API tree is extracted, so `linkcode_resolve` is only a
+  lookup for the documented objects. Indexing is best-effort: objects which
+  fail are not indexed, and are resolved lazily by `linkcode_resolve`.
+
+  Args:
+    qualname: Name of the object, as documented by autodoc (e.g.
+      `my_project.MyClass`)
+    obj: The class or function
+  """
+  module_name, _, name = qualname.rpartition('.')
+  locations = {}
+  try:
+    locations[name] = _get_obj_lines_suffix(module_name, obj)
+    attr_names = list(vars(obj)) if isinstance(obj, type) else []
+  except Exception:  # pylint: disable=broad-except
+    return
+  for attr_name in attr_names:
+    if attr_name.startswith('_'):
+      continue
+    try:
+      attr = getattr(obj, attr_name)
+      locations[f'{name}.{attr_name}'] = _get_obj_lines_suffix(
+          module_name, attr
+      )
+    except Exception:  # pylint: disable=broad-except
+      continue  # E.g. descriptors raising on class access
+  for fullname, suffix in locations.items():
+    context.ctx.source_locations[(module_name, fullname)] = suffix
 
 
 def _get_lines_suffix(module_name: str, qualname: str) -> str:
@@ -56,7 +109,12 @@ def _get_lines_suffix(module_name: str, qualname: str) -> str:
       obj = getattr(obj, part)
     except AttributeError:
       return ''  # Object unavailable
+  return _get_obj_lines_suffix(module_name, obj)
 
+
+def _get_obj_lines_suffix(module_name: str, obj: Any) -> str:
+  if isinstance(obj, property):
+    obj = obj.fget
   # Unwrap until the last file inside the project
   try:
     obj = _unwraps(obj)
@@ -71,9 +129,8 @@ def _get_lines_suffix(module_name: str, qualname: str) -> str:
   if module_name is None:
     return ''
 
-  try:
-    lines = inspect.getsourcelines(obj)
-  except (TypeError, OSError):
+  span = _get_source_span(module_name, obj)
+  if span is None:
     return ''
 
   # Detect if file is inside the project (and not `Union` or similar)
@@ -81,22 +138,54 @@ def _get_lines_suffix(module_name: str, qualname: str) -> str:
   if not filepath:
     return ''
 
-  start = lines[1]
-  end = start + len(lines[0]) - 1
+  start, end = span
   return f'{filepath}#L{start}-L{end}'
 
 
+def _get_source_span(module_name: str, obj: Any) -> tuple[int, int] | None:
+  """Like `inspect.getsourcelines`, but without re-scanning the file.
+
+  The spans are read from the module definitions table (parsed once per
+  module). Fallback to `inspect` for objects not found in the table (e.g.
+  dynamically created).
+
+  Args:
+    module_name: Module in which the object is defined
+    obj: The class or function
+
+  Returns:
+    The `(start, end)` lines, or `None` if the source is not available.
+  """
+  qualname = getattr(obj, '__qualname__', None)
+  if isinstance(qualname, str) and '<locals>' not in qualname:
+    try:
+      spans = ast_utils.module_source(module_name).definitions.get(qualname)
+    except (ValueError, OSError, SyntaxError):  # Source not available
+      spans = None
+    if spans:
+      code = getattr(obj, '__code__', None)
+      if code is None:  # Classes: last definition
+        return spans[-1]
+      # Functions: select the re-definition (e.g. `@typing.overload`)
+      for span in spans:
+        if span[0] == code.co_firstlineno:
+          return span
+
+  try:
+    lines, start = inspect.getsourcelines(obj)
+  except (TypeError, OSError):
+    return None
+  return start, start + len(lines) - 1
+
+
 @functools.cache
 def get_github_url() -> str:
   # TODO(epot): Support cross-repo
-  out = subprocess.run(
-      'git config --get remote.origin.url',
-      shell=True,
-      capture_output=True,
-      text=True,
-  )
-  url = out.stdout.strip().removesuffix('.git')
-  assert url.startswith('https://github.com')
+  url = git_utils.git_info().remote_url or ''
+  url = url.removesuffix('.git')
+  if url.startswith('git@github.com:'):  # SSH remote
+    url = url.replace('git@github.com:', 'https://github.com/', 1)
+  assert url.startswith('https://github.com'), url
   return url
 
 
@@ -0,0 +1,128 @@
+import inspect
+
+from etils import epath
+
+from apitree import context, writer
+from apitree.ext import github_link
+
+
+def test_linkcode_resolve_index(tmp_path, make_package, monkeypatch):
+  monkeypatch.setattr(context.ctx, 'source_locations', {})
+  info = make_package(
+      'apitree_linkcode_pkg',
+      {
+          '__init__.py': """
+              class MyClass:
+
+                def method(self):
+                  pass
+
+
+              def my_fn():
+                pass
+
+
+              class _Raising:
+
+                def __get__(self, obj, objtype=None):
+                  raise RuntimeError('No class access')
+
+
+              MyClass.broken = _Raising()
+              """,
+      },
+  )
+  # Attributes failing on class access are not indexed
+  writer.write_doc(info, root_dir=epath.Path(tmp_path / 'api'), verbose=False)
+
+  # Documented objects are resolved from the index, without importing them
+  def _get_lines_suffix(module_name, fullname):
+    raise AssertionError(f'Not indexed: {module_name}:{fullname}')
+
+  monkeypatch.setattr(github_link, '_get_lines_suffix', _get_lines_suffix)
+
+  def resolve(fullname):
+    return github_link.linkcode_resolve(
+        'py', {'module': 'apitree_linkcode_pkg', 'fullname': fullname}
+    )
+
+  url = 'https://github.com/user/repo/tree/main/apitree_linkcode_pkg'
+  assert resolve('MyClass') == f'{url}/__init__.py#L2-L5'
+  assert resolve('MyClass.method') == f'{url}/__init__.py#L4-L5'
+  assert resolve('my_fn') == f'{url}/__init__.py#L8-L9'
+
+
+def test_source_span(make_package, monkeypatch):
+  num_methods = 300
+  make_package(
+      'apitree_source_span_pkg',
+      {
+          '__init__.py': '\n'.join([
+              'import functools',
+              'import typing',
+              '',
+              '',
+              'class MyClass:',
+              '',
+              '  class Nested:',
+              '',
+              '    def method(self):',
+              '      pass',
+              '',
+              '  @property',
+              '  def prop(self):',
+              '    return 1',
+              '',
+              '  @prop.setter',
+              '  def prop(self, value):',
+              '    pass',
+              '',
+              '  @classmethod',
+              '  @functools.cache',
+              '  def cls_method(cls):',
+              '    pass',
+              '',
+              *(f'  def fn{i}(self):\n    pass\n' for i in range(num_methods)),
+              '',
+              '@typing.overload',
+              'def my_fn(x: int) -> int:',
+              '  ...',
+              '',
+              'def my_fn(x):',
+              '  return x',
+              '',
+              'if True:',
+              '',
+              '  def cond_fn():',
+              '    pass',
+          ]),
+      },
+  )
+  # pylint: disable-next=import-outside-toplevel
+  import apitree_source_span_pkg as pkg
+
+  objs = {
+      'MyClass': pkg.MyClass,
+      'MyClass.Nested': pkg.MyClass.Nested,
+      'MyClass.Nested.method': pkg.MyClass.Nested.method,
+      'MyClass.prop': pkg.MyClass.prop.fget,
+      'MyClass.cls_method': pkg.MyClass.cls_method,
+      'my_fn': pkg.my_fn,
+      'cond_fn': pkg.cond_fn,
+  }
+  objs |= {f'fn{i}': getattr(pkg.MyClass, f'fn{i}') for i in range(num_methods)}
+  expected = {}
+  for name, obj in objs.items():
+    lines, start = inspect.getsourcelines(obj)
+    expected[name] = (start, start + len(lines) - 1)
+
+  # Spans are read from the definitions table, without re-scanning the file
+  def getsourcelines(obj):
+    raise AssertionError(f'Not found in the definitions table: {obj}')
+
+  monkeypatch.setattr(inspect, 'getsourcelines', getsourcelines)
+  spans = {
+      name: github_link._get_source_span('apitree_source_span_pkg', obj)
+      for name, obj in objs.items()
+  }
+  assert spans == expected
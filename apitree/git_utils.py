@@ -0,0 +1,119 @@
+"""Git metadata (repository root, remote url, commit).
+
+Metadata are read directly from the `.git/` files (no `git` subprocess), with
+a fallback on the `git` command for unsupported layouts.
+"""
+
+from __future__ import annotations
+
+import configparser
+import dataclasses
+import functools
+import os
+import pathlib
+import subprocess
+from typing import Optional
+
+from apitree import profile_utils
+
+
+@dataclasses.dataclass(frozen=True)
+class GitInfo:
+  """Git repository metadata.
+
+  Attributes:
+    root: Root directory of the repository
+    remote_url: Url of the `origin` remote
+    commit: Sha of the current commit
+  """
+
+  root: pathlib.Path
+  remote_url: Optional[str]
+  commit: Optional[str]
+
+
+@functools.cache
+def git_info(path: Optional[pathlib.Path] = None) -> GitInfo:
+  """Returns the metadata of the repository containing `path` (default: cwd)."""
+  path = pathlib.Path(path or os.getcwd()).resolve()
+  try:
+    return _read_git_info(path)
+  except (OSError, ValueError, KeyError, configparser.Error):
+    return _git_info_from_subprocess(path)
+
+
+def _read_git_info(path: pathlib.Path) -> GitInfo:
+  root, git_dir = _find_git_dir(path)
+  # Worktrees share the config and refs with the main repository
+  common_dir = git_dir
+  if (git_dir / 'commondir').exists():
+    common_dir = git_dir / (git_dir / 'commondir').read_text().strip()
+
+  return GitInfo(
+      root=root,
+      remote_url=_read_remote_url(common_dir),
+      commit=_read_head(git_dir, common_dir),
+  )
+
+
+def _find_git_dir(path: pathlib.Path) -> tuple[pathlib.Path, pathlib.Path]:
+  for root in (path, *path.parents):
+    git_path = root / '.git'
+    if git_path.is_dir():
+      return root, git_path
+    if git_path.is_file():  # Worktree or submodule: `gitdir: <path>`
+      content = git_path.read_text().strip()
+      if not content.startswith('gitdir:'):
+        raise ValueError(f'Unexpected .git file: {content!r}')
+      git_dir = content.removeprefix('gitdir:').strip()
+      return root, (root / git_dir).resolve()
+  raise ValueError(f'{path} is not inside a git repository.')
+
+
+def _read_remote_url(common_dir: pathlib.Path) -> Optional[str]:
+  config = configparser.ConfigParser(strict=False, interpolation=None)
+  config.read(common_dir / 'config')
+  section = 'remote "origin"'
+  if not config.has_option(section, 'url'):
+    return None
+  return config.get(section, 'url')
+
+
+def _read_head(git_dir: pathlib.Path, common_dir: pathlib.Path) -> str:
+  head = (git_dir / 'HEAD').read_text().strip()
+  if not head.startswith('ref:'):  # Detached HEAD
+    return head
+  ref = head.removeprefix('ref:').strip()
+  for dirname in (git_dir, common_dir):
+    ref_path = dirname / ref
+    if ref_path.exists():
+      return ref_path.read_text().strip()
+  # The ref might be packed
+  packed_refs = common_dir / 'packed-refs'
+  for line in packed_refs.read_text().splitlines():
+    if line.startswith(('#', '^')):
+      continue
+    sha, name = line.split(' ', 1)
+    if name == ref:
+      return sha
+  raise KeyError(f'Could not resolve {ref}')
+
+
+def _git_info_from_subprocess(path: pathlib.Path) -> GitInfo:
+  return GitInfo(
+      root=pathlib.Path(_run_git('rev-parse --show-toplevel', path)),
+      remote_url=_run_git('config --get remote.origin.url', path) or None,
+      commit=_run_git('rev-parse HEAD', path) or None,
+  )
+
+
+def _run_git(cmd: str, path: pathlib.Path) -> str:
+  with profile_utils.timed('git'):
+    out = subprocess.run(
+        f'git {cmd}',
+        shell=True,
+        capture_output=True,
+        text=True,
+        cwd=path,
+    )
+  return out.stdout.strip()
@@ -0,0 +1,26 @@
+import subprocess
+
+from apitree import git_utils
+
+
+def _git(cmd, cwd):
+  subprocess.run(f'git {cmd}', shell=True, check=True, cwd=cwd)
+
+
+def test_git_info(tmp_path):
+  _git('init -q -b main', tmp_path)
+  _git('remote add origin https://github.com/user/repo.git', tmp_path)
+  _git(
+      '-c user.name=a -c user.email=a@a.com commit -q --allow-empty -m x',
+      tmp_path,
+  )
+  (tmp_path / 'subdir').mkdir()
+
+  expected = git_utils._git_info_from_subprocess(tmp_path)
+  assert expected.remote_url == 'https://github.com/user/repo.git'
+  assert len(expected.commit) == 40
+
+  assert git_utils._read_git_info(tmp_path / 'subdir') == expected
+
+  _git('pack-refs --all', tmp_path)  # Refs moved to `.git/packed-refs`
+  assert git_utils._read_git_info(tmp_path) == expected
@@ -1,18 +1,21 @@
 import functools
 import importlib
+import importlib.machinery
+import importlib.util
 import inspect
 import pathlib
-import subprocess
+import sys
 
+from apitree import git_utils
 from apitree.context import ctx
 
 
 @functools.cache
 def module_path(module_name: str) -> pathlib.Path:
   """Get absolute path of a module."""
-  root_module = importlib.import_module(module_name)
-  root_module_path = inspect.getsourcefile(root_module)
-  root_module_path = pathlib.Path(root_module_path)
+  root_module_path = abs_path(module_name)
+  if root_module_path is None:
+    raise ValueError(f'Could not find the source file of {module_name}')
   return root_module_path
 
 
@@ -26,21 +29,23 @@ def repo_path() -> pathlib.Path:
     return _git_repo_path()
 
 
-@functools.cache
 def _git_repo_path():
-  out = subprocess.run(
-      'git rev-parse --show-toplevel',
-      shell=True,
-      capture_output=True,
-      text=True,
-  )
-  path = out.stdout.strip()
-  return pathlib.Path(path)
+  return git_utils.git_info().root
 
 
 @functools.cache
 def abs_path(module_name: str) -> pathlib.Path:
-  filepath = inspect.getsourcefile(importlib.import_module(module_name))
+  if module_name in sys.modules:
+    filepath = inspect.getsourcefile(sys.modules[module_name])
+  else:
+    # Do not import the module if not already imported
+    spec = find_spec(module_name)
+    if spec is None:
+      filepath = inspect.getsourcefile(importlib.import_module(module_name))
+    elif spec.origin and spec.origin.endswith('.py'):
+      filepath = spec.origin
+    else:
+      filepath = None
   if filepath is None:  # E.g. C++ modules
     return None
   filepath = pathlib.Path(filepath)
@@ -48,9 +53,20 @@ def abs_path(module_name: str) -> pathlib.Path:
 
 
 @functools.cache
-def module_lines(module_name: str) -> list[str]:
-  filepath = abs_path(module_name)
-  return filepath.read_text().split('\n')
+def find_spec(module_name: str) -> importlib.machinery.ModuleSpec | None:
+  """Like `importlib.util.find_spec`, but never import the parent packages."""
+  if module_name in sys.modules or '.' not in module_name:
+    try:
+      return importlib.util.find_spec(module_name)
+    except ValueError:  # `__spec__` is `None` (e.g. `__main__`)
+      return None
+  parent_name, _ = module_name.rsplit('.', 1)
+  parent_spec = find_spec(parent_name)
+  if parent_spec is None or parent_spec.submodule_search_locations is None:
+    return None
+  return importlib.machinery.PathFinder.find_spec(
+      module_name, parent_spec.submodule_search_locations
+  )
 
 
 def belong_to_repo(module_name: str) -> bool:
@@ -67,3 +83,34 @@ def repo_relative_path(module_name: str) -> pathlib.Path:
     return filepath.relative_to(repo_path())
   except ValueError:
     return None
+
+
+def resolve_relative_import(
+    module_name: str,
+    import_name: str | None,
+    *,
+    level: int,
+    is_package: bool,
+) -> str:
+  """Resolve `from ..x import y` into the absolute module name.
+
+  Args:
+    module_name: Module containing the import statement
+    import_name: The imported module (`x` in `from ..x import y`, `None` for
+      `from . import y`)
+    level: Number of leading dots
+    is_package: Whether `module_name` is a package (`__init__.py`)
+
+  Returns:
+    The absolute module name (e.g. `my_project.x`)
+  """
+  if not level:
+    return import_name
+  parts = module_name.split('.')
+  if not is_package:
+    parts = parts[:-1]
+  if level > 1:
+    parts = parts[: -(level - 1)]
+  if import_name:
+    parts.append(import_name)
+  return '.'.join(parts)
@@ -0,0 +1,96 @@
+"""Per-object analysis, shared by all the symbols pointing to the same object.
+
+The same object can be visited many times in the API tree (e.g. a class
+defined in `my_project.sub.module` and re-exported in `my_project`). The
+results which only depend on the object (not on the name or parent module) are
+computed once and cached by object identity.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+import sys
+import typing
+from typing import Any, Optional
+
+from apitree import context, slot_utils
+
+if typing.TYPE_CHECKING:
+  from apitree import tree_extractor
+
+
+@dataclasses.dataclass(slots=True, eq=False)
+class ObjectInfo:
+  """Analysis of a single object.
+
+  Attributes:
+    value: The object (kept alive, so its `id` is not re-used)
+    canonical: First documented node pointing to the object (the other nodes
+      are rendered as aliases of this one)
+  """
+
+  value: Any
+  canonical: Optional[tree_extractor.Node] = None
+
+  _unwrapped: Any = slot_utils.cache_field()
+  _docstring_1line: str = slot_utils.cache_field()
+
+  @slot_utils.cached_slot
+  def unwrapped(self) -> Any:
+    """The object unwrapped from its decorators (`@functools.cache`,...)."""
+    return _static_unwrap(self.value)
+
+  @slot_utils.cached_slot
+  def docstring_1line(self) -> str:
+    if not getattr(self.value, '__doc__', None):
+      return ''
+    else:
+      return self.value.__doc__.split('\n', 1)[0]
+
+
+def get(value: Any) -> ObjectInfo:
+  """Returns the (cached) `ObjectInfo` of the object."""
+  info = context.ctx.objects.get(id(value))
+  if info is None:
+    # `setdefault` as pages are rendered in parallel
+    info = context.ctx.objects.setdefault(id(value), ObjectInfo(value))
+  return info
+
+
+def set_canonical(node: tree_extractor.Node) -> bool:
+  """Register the node as canonical page of its value, if none already.
+
+  Args:
+    node: The documented node
+
+  Returns:
+    `True` if the node is the canonical one, `False` if it is an alias.
+  """
+  info = get(node.symbol.value)
+  if info.canonical is None:
+    info.canonical = node
+  return info.canonical is node
+
+
+def clear() -> None:
+  """Drop the cached objects (once the pages are written)."""
+  context.ctx.objects = {}
+
+
+def _static_unwrap(func):
+  """Like `inspect.unwrap`, but do not trigger `__getattr__`."""
+  f = func  # remember the original func for error reporting
+  # Memoise by id to tolerate non-hashable objects, but store objects to
+  # ensure they aren't destroyed, which would allow their IDs to be reused.
+  memo = {id(f): f}
+  recursion_limit = sys.getrecursionlimit()
+  while not isinstance(func, type) and inspect.getattr_static(
+      func, '__wrapped__', None
+  ):
+    func = func.__wrapped__
+    id_func = id(func)
+    if (id_func in memo) or (len(memo) >= recursion_limit):
+      raise ValueError('wrapper loop when unwrapping {!r}'.format(f))
+    memo[id_func] = func
+  return func
@@ -0,0 +1,21 @@
+"""Relative urls between the documentation pages."""
+
+import functools
+import posixpath
+
+
+@functools.lru_cache(maxsize=100_000)
+def relative_url(from_doc: str, to_doc: str) -> str:
+  """Returns the url of `to_doc`, relative to the page `from_doc`.
+
+  Both paths should be relative to the same root (e.g. `api/x/y.md` and
+  `api/x/z/index.md` returns `z/index.md`).
+
+  Args:
+    from_doc: Page containing the link (posix path)
+    to_doc: Page linked (posix path)
+
+  Returns:
+    The relative url
+  """
+  return posixpath.relpath(to_doc, posixpath.dirname(from_doc) or '.')
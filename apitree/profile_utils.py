@@ -0,0 +1,152 @@
+"""Build-time profiling (phase timings and counters).
+
+Enabled with `make_project(profile=...)` or the `APITREE_PROFILE` env
+variable (`APITREE_PROFILE=1` to print the report,
+`APITREE_PROFILE=path/to/report.json` to also save it as JSON).
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import dataclasses
+import json
+import os
+import pathlib
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any, Optional
+
+
+@dataclasses.dataclass
+class _Timing:
+  total: float = 0.0
+  calls: int = 0
+
+
+class Profiler:
+  """Accumulate the timings and counters of the build."""
+
+  def __init__(self):
+    self.enabled: bool = False
+    # Where to save the JSON report (`None` to only print the report)
+    self.output: Optional[pathlib.Path] = None
+    self.reset()
+
+  def reset(self) -> None:
+    self._lock = threading.Lock()
+    self.phases: dict[str, _Timing] = collections.defaultdict(_Timing)
+    self.modules: dict[str, dict[str, _Timing]] = collections.defaultdict(
+        lambda: collections.defaultdict(_Timing)
+    )
+    self.counters: collections.Counter[str] = collections.Counter()
+
+  def add_time(
+      self, phase: str, duration: float, *, module: Optional[str] = None
+  ) -> None:
+    with self._lock:
+      timing = self.phases[phase]
+      timing.total += duration
+      timing.calls += 1
+      if module is not None:
+        timing = self.modules[module][phase]
+        timing.total += duration
+        timing.calls += 1
+
+  def count(self, name: str, value: int = 1) -> None:
+    with self._lock:
+      self.counters[name] += value
+
+  def merge(self, report: dict[str, Any]) -> None:
+    """Merge a report from `as_json` (e.g. from another process)."""
+    with self._lock:
+      for name, timing in report['phases'].items():
+        self.phases[name].total += timing['total']
+        self.phases[name].calls += timing['calls']
+      for module, phases in report['modules'].items():
+        for name, timing in phases.items():
+          self.modules[module][name].total += timing['total']
+          self.modules[module][name].calls += timing['calls']
+      self.counters.update(report['counters'])
+
+  def as_json(self) -> dict[str, Any]:
+    return {
+        'phases': {k: dataclasses.asdict(v) for k, v in self.phases.items()},
+        'modules': {
+            module: {k: dataclasses.asdict(v) for k, v in phases.items()}
+            for module, phases in self.modules.items()
+        },
+        'counters': dict(self.counters),
+    }
+
+  def as_text(self) -> str:
+    lines = ['apitree profile:', '  Phases:']
+    for name, timing in sorted(
+        self.phases.items(), key=lambda kv: -kv[1].total
+    ):
+      lines.append(
+          f'    {name:<20} {timing.total:9.3f}s  ({timing.calls} calls)'
+      )
+    lines.append('  Slowest modules:')
+    module_totals = {
+        module: sum(t.total for t in phases.values())
+        for module, phases in self.modules.items()
+    }
+    for module, total in sorted(
+        module_totals.items(), key=lambda kv: -kv[1]
+    )[:10]:
+      lines.append(f'    {module:<40} {total:9.3f}s')
+    lines.append('  Counters:')
+    for name, value in sorted(self.counters.items()):
+      lines.append(f'    {name:<20} {value}')
+    return '\n'.join(lines)
+
+  def report(self) -> None:
+    """Print the report (and save it if `output` is set)."""
+    print(self.as_text())
+    if self.output is not None:
+      self.output.parent.mkdir(parents=True, exist_ok=True)
+      self.output.write_text(json.dumps(self.as_json(), indent=2))
+
+
+profiler = Profiler()
+
+
+def enable(output: bool | str | os.PathLike[str] = True) -> None:
+  """Activate the profiling.
+
+  Args:
+    output: `True` to print the report, or a path to also save the report as
+      JSON.
+  """
+  profiler.enabled = bool(output)
+  if output and not isinstance(output, bool):
+    profiler.output = pathlib.Path(output)
+
+
+def enable_from_env() -> None:
+  """Activate the profiling if the `APITREE_PROFILE` env variable is set."""
+  value = os.environ.get('APITREE_PROFILE')
+  if not value or value == '0':
+    return
+  enable(True if value == '1' else value)
+
+
+@contextlib.contextmanager
+def timed(phase: str, *, module: Optional[str] = None) -> Iterator[None]:
+  """Measure the time spent inside the block."""
+  if not profiler.enabled:
+    yield
+    return
+  start = time.perf_counter()
+  try:
+    yield
+  finally:
+    profiler.add_time(phase, time.perf_counter() - start, module=module)
+
+
+def count(name: str, value: int = 1) -> None:
+  """Increment the counter."""
+  if profiler.enabled:
+    profiler.count(name, value)
@@ -0,0 +1,30 @@
+import json
+
+from apitree import profile_utils
+
+
+def test_profiler(tmp_path, monkeypatch):
+  profiler = profile_utils.Profiler()
+  monkeypatch.setattr(profile_utils, 'profiler', profiler)
+
+  with profile_utils.timed('import'):  # Disabled by default
+    pass
+  assert not profiler.phases
+
+  profile_utils.enable(tmp_path / 'report.json')
+  for _ in range(2):
+    with profile_utils.timed('import', module='my_module'):
+      pass
+  profile_utils.count('bytes_written', 10)
+  profile_utils.count('bytes_written', 5)
+
+  # Reports from other processes are merged
+  other = profile_utils.Profiler()
+  other.count('bytes_written', 1)
+  profiler.merge(other.as_json())
+
+  profiler.report()
+  report = json.loads((tmp_path / 'report.json').read_text())
+  assert report['phases']['import']['calls'] == 2
+  assert report['modules']['my_module']['import']['calls'] == 2
+  assert report['counters'] == {'bytes_written': 16}
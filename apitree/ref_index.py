@@ -0,0 +1,165 @@
+"""Index of the documented symbols, to resolve the `auto_ref` references."""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import pathlib
+import types
+import typing
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, Optional
+
+if typing.TYPE_CHECKING:
+  from apitree import tree_extractor
+
+
+@dataclasses.dataclass(frozen=True)
+class Ref:
+  """Reference to a symbol page (serializable across processes).
+
+  Attributes:
+    qualname: Symbol name (e.g. `dca.typing.Float`)
+    filename: Page of the symbol, relative to `docs/api/`
+  """
+
+  qualname: str
+  filename: pathlib.Path
+
+
+class RefCandidate(typing.NamedTuple):
+  """Name which could resolve to `ref`.
+
+  When multiple pages match the same name, the one with the lowest `rank` is
+  selected.
+  """
+
+  name: str
+  rank: tuple[int, int]
+  ref: Ref
+
+
+def candidates_from_node(node: tree_extractor.Node) -> Iterator[RefCandidate]:
+  """Returns all the names under which the node can be referenced.
+
+  Names include:
+
+  * The full name (`dca.typing.Float`)
+  * The real module name (`dataclass_array.typing.Float`)
+  * The shorter names (`typing.Float`, `Float`)
+  * The decorator forms (`@dca.my_decorator`)
+  * The methods and attributes defined by classes (`dca.MyClass.method`,
+    `MyClass.method`), which link to the class page (inherited ones are
+    documented by their own class)
+
+  Args:
+    node: A documented node.
+
+  Yields:
+    The candidates
+  """
+  # Import here to avoid circular imports
+  from apitree import symbol_match  # pylint: disable=import-outside-toplevel
+
+  symbol = node.symbol
+  ref = Ref(qualname=symbol.qualname, filename=node.match.filename)
+  icon = node.match.icon
+  is_decorator = icon in (
+      symbol_match.SymbolType.FUNCTION,
+      symbol_match.SymbolType.CLASS,
+  )
+
+  names = list(_suffixes(symbol.qualname, min_parts=1))
+  if symbol.qualname_no_alias and symbol.qualname_no_alias != symbol.qualname:
+    # `qualname_no_alias` is acually the real module name.
+    # For example:
+    # * `kd.typing.XX`  # Public symbol
+    # * `kauldron.typing.XX`  # Alias replaced
+    # * `kauldron.utils.typing.XX`  # Real module location
+    names.append((symbol.qualname_no_alias, 0))
+
+  num_parts = symbol.qualname.count('.')
+  for name, num_stripped in names:
+    rank = (num_stripped, num_parts)
+    yield RefCandidate(name=name, rank=rank, ref=ref)
+    if is_decorator:
+      yield RefCandidate(name=f'@{name}', rank=rank, ref=ref)
+
+  if icon == symbol_match.SymbolType.CLASS:
+    for attr_name in _public_attributes(symbol.value):
+      for name, num_stripped in _suffixes(
+          f'{symbol.qualname}.{attr_name}', min_parts=2
+      ):
+        rank = (num_stripped, num_parts)
+        yield RefCandidate(name=name, rank=rank, ref=ref)
+
+
+def _suffixes(qualname: str, *, min_parts: int) -> Iterator[tuple[str, int]]:
+  """Yields `('a.b.c', 0)`, `('b.c', 1)`, `('c', 2)`."""
+  parts = qualname.split('.')
+  for i in range(len(parts) - min_parts + 1):
+    yield '.'.join(parts[i:]), i
+
+
+def _public_attributes(cls: type[Any]) -> list[str]:
+  try:
+    # Only the attributes defined by the class (not the inherited ones)
+    return [name for name in vars(cls) if not name.startswith('_')]
+  except Exception:  # pylint: disable=broad-except
+    return []  # Some metaclasses do not support `vars`
+
+
+class RefIndex:
+  """Frozen mapping name -> `Ref`, resolved in constant time."""
+
+  def __init__(self, refs: Mapping[str, Ref]):
+    self._refs = types.MappingProxyType(dict(refs))
+
+  @classmethod
+  def build(cls, candidates: Iterable[RefCandidate]) -> RefIndex:
+    """Build the index, keeping only the best ranked ref for each name.
+
+    If multiple different pages share the best rank for a name, the name is
+    ambiguous and is not indexed.
+
+    Args:
+      candidates: All the candidates
+
+    Returns:
+      The index
+    """
+    name_to_candidates = collections.defaultdict(list)
+    for candidate in candidates:
+      name_to_candidates[candidate.name].append(candidate)
+
+    refs = {}
+    for name, name_candidates in name_to_candidates.items():
+      best_rank = min(c.rank for c in name_candidates)
+      best = {
+          c.ref.filename: c.ref
+          for c in name_candidates
+          if c.rank == best_rank
+      }
+      if len(best) == 1:
+        (refs[name],) = best.values()
+    return cls(refs)
+
+  def resolve(self, name: str) -> Optional[Ref]:
+    return self._refs.get(name)
+
+  def __len__(self) -> int:
+    return len(self._refs)
+
+  def to_json(self) -> dict[str, list[str]]:
+    """Serialize the index (e.g. to reuse it across builds)."""
+    return {
+        name: [ref.qualname, ref.filename.as_posix()]
+        for name, ref in self._refs.items()
+    }
+
+  @classmethod
+  def from_json(cls, value: dict[str, list[str]]) -> RefIndex:
+    return cls({
+        name: Ref(qualname=qualname, filename=pathlib.Path(filename))
+        for name, (qualname, filename) in value.items()
+    })
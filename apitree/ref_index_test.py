@@ -0,0 +1,89 @@
+import pathlib
+
+from apitree import ref_index, tree_extractor
+
+
+def test_ref_index(make_package):
+  info = make_package(
+      'apitree_refs_pkg',
+      {
+          '__init__.py': """
+              from apitree_refs_pkg import sub
+              from apitree_refs_pkg import other
+              from apitree_refs_pkg.sub import Base, MyClass, Sub, my_fn
+              """,
+          'sub/__init__.py': """
+              class Base:
+                def forward(self):
+                  pass
+
+              class MyClass(Base):
+                def method(self):
+                  pass
+
+              class Sub(Base):
+                def forward(self):
+                  pass
+
+              def my_fn():
+                pass
+              """,
+          'other/__init__.py': """
+              def my_fn():
+                pass
+              """,
+      },
+  )
+  node = tree_extractor.get_api_tree(info)
+  index = ref_index.RefIndex.build(
+      c
+      for n in node.iter_documented_nodes()
+      for c in ref_index.candidates_from_node(n)
+  )
+
+  def resolve(name):
+    ref = index.resolve(name)
+    return ref and ref.filename.as_posix()
+
+  assert resolve('apitree_refs_pkg.sub.MyClass') == (
+      'apitree_refs_pkg/sub/MyClass.md'
+  )
+  # Short names resolve to the most public symbol
+  assert resolve('MyClass') == 'apitree_refs_pkg/MyClass.md'
+  assert resolve('@my_fn') == 'apitree_refs_pkg/my_fn.md'
+  assert resolve('sub.my_fn') == 'apitree_refs_pkg/sub/my_fn.md'
+  # Methods link to the class page
+  assert resolve('MyClass.method') == 'apitree_refs_pkg/MyClass.md'
+  assert resolve('sub.MyClass.method') == 'apitree_refs_pkg/sub/MyClass.md'
+  assert resolve('apitree_refs_pkg') == 'apitree_refs_pkg/index.md'
+  assert resolve('method') is None  # Methods require the class name
+  # Inherited attributes are documented by their class
+  assert resolve('MyClass.forward') is None
+  assert resolve('Base.forward') == 'apitree_refs_pkg/Base.md'
+  assert resolve('Sub.forward') == 'apitree_refs_pkg/Sub.md'
+  # Only the class itself has a decorator form
+  assert resolve('@MyClass') == 'apitree_refs_pkg/MyClass.md'
+  assert resolve('@MyClass.method') is None
+  assert resolve('unknown') is None
+
+  assert ref_index.RefIndex.from_json(index.to_json()).resolve(
+      'MyClass'
+  ) == ref_index.Ref(
+      qualname='apitree_refs_pkg.MyClass',
+      filename=pathlib.Path('apitree_refs_pkg/MyClass.md'),
+  )
+
+
+def test_ref_index_ambiguous():
+  def candidate(name, filename):
+    ref = ref_index.Ref(qualname=filename, filename=pathlib.Path(filename))
+    return ref_index.RefCandidate(name=name, rank=(1, 2), ref=ref)
+
+  index = ref_index.RefIndex.build([
+      candidate('fn', 'a/fn.md'),
+      candidate('fn', 'b/fn.md'),
+      candidate('cls', 'a/cls.md'),
+      candidate('cls', 'a/cls.md'),
+  ])
+  assert index.resolve('fn') is None
+  assert index.resolve('cls').qualname == 'a/cls.md'
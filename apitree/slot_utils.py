@@ -0,0 +1,51 @@
+"""Utils for compact (`__slots__`) classes."""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable
+from typing import Any, Generic, TypeVar
+
+_T = TypeVar('_T')
+
+# Default value of the `cached_slot` backing fields
+UNSET: Any = object()
+
+
+class cached_slot(Generic[_T]):  # pylint: disable=invalid-name
+  """Like `functools.cached_property`, but compatible with `__slots__`.
+
+  The value is stored in the `_<name>` attribute, which should be declared
+  with `cache_field()`.
+
+  ```python
+  @dataclasses.dataclass(slots=True)
+  class A:
+    _value: int = slot_utils.cache_field()
+
+    @slot_utils.cached_slot
+    def value(self) -> int:
+      return 1
+  ```
+  """
+
+  def __init__(self, fn: Callable[[Any], _T]):
+    self.fn = fn
+    self.__doc__ = fn.__doc__
+    self.attr_name = f'_{fn.__name__}'
+
+  def __get__(self, obj, objtype=None) -> _T:
+    if obj is None:
+      return self
+    value = getattr(obj, self.attr_name)
+    if value is UNSET:
+      value = self.fn(obj)
+      setattr(obj, self.attr_name, value)
+    return value
+
+
+def cache_field() -> Any:
+  """Backing field of a `cached_slot`."""
+  return dataclasses.field(
+      default=UNSET, init=False, repr=False, compare=False
+  )
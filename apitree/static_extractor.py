@@ -0,0 +1,317 @@
+"""Static (no-import) extraction of the module symbols.
+
+Reconstruct the module objects from their source files (with `ast`), without
+executing any user code. The modules are filled with placeholder values
+(stub classes, functions, type aliases,...), so the `symbol_match`
+classification is the same as for the imported modules.
+"""
+
+from __future__ import annotations
+
+import __future__
+import ast
+import builtins
+import types
+import typing
+from typing import Any
+
+from apitree import ast_utils, context, import_utils, profile_utils
+
+# `ast.TryStar` (`except*`) was added in Python 3.11
+_TRY_NODES = tuple(
+    getattr(ast, name) for name in ('Try', 'TryStar') if hasattr(ast, name)
+)
+
+
+class StaticValue:
+  """Placeholder for values which cannot be inferred without executing code.
+
+  For example: `x = some_fn()`, or values imported from external modules.
+  """
+
+  def __init__(self, module_name: str, name: str):
+    self.__module__ = module_name
+    self.__name__ = name
+    self.__qualname__ = name
+    self.__doc__ = None
+
+  def __repr__(self) -> str:
+    return f'{type(self).__name__}({self.__module__}.{self.__name__})'
+
+
+# Modules from which the type annotations are imported
+_TYPING_MODULES = frozenset({'typing', 'typing_extensions', 'collections.abc'})
+
+# Static modules, in construction or built (similar to `sys.modules`)
+_MODULES: dict[str, types.ModuleType] = {}
+
+
+def load_module(module_name: str) -> types.ModuleType:
+  """Returns the module reconstructed statically from its source.
+
+  Modules outside the project (external modules, C++ modules,...) are returned
+  as empty modules.
+
+  Args:
+    module_name: Module to load (e.g. `my_project.sub.module`)
+
+  Returns:
+    The static module
+  """
+  if module_name in _MODULES:  # Already loaded (or circular imports)
+    return _MODULES[module_name]
+
+  module = types.ModuleType(module_name)
+  _MODULES[module_name] = module
+
+  if not _is_project_module(module_name):
+    return module
+  spec = import_utils.find_spec(module_name)
+  if spec is None or not (spec.origin and spec.origin.endswith('.py')):
+    return module  # Source not available
+
+  is_package = spec.submodule_search_locations is not None
+  module.__file__ = spec.origin
+  module.__package__ = (
+      module_name if is_package else module_name.rpartition('.')[0]
+  )
+  if is_package:
+    module.__path__ = list(spec.submodule_search_locations)
+
+  with profile_utils.timed('static_load', module=module_name):
+    source = ast_utils.module_source(module_name)
+    module.__doc__ = ast.get_docstring(source.tree)
+    _ModuleBuilder(module).visit_body(source.tree.body)
+    if source.all_names is not None:  # Includes `__all__ += [...]`
+      module.__all__ = list(source.all_names)
+  return module
+
+
+def clear() -> None:
+  """Drop the loaded modules (which modules are external depends on the API)."""
+  _MODULES.clear()
+
+
+def _is_project_module(module_name: str) -> bool:
+  root_name = context.ctx.curr.module_name.split('.', 1)[0]
+  return module_name == root_name or module_name.startswith(f'{root_name}.')
+
+
+def _is_submodule(module_name: str) -> bool:
+  if not _is_project_module(module_name):
+    return False
+  try:
+    return import_utils.find_spec(module_name) is not None
+  except (ImportError, ValueError):
+    return False
+
+
+class _ModuleBuilder:
+  """Fill the static module from the AST statements."""
+
+  def __init__(self, module: types.ModuleType):
+    self.module = module
+    self.module_name = module.__name__
+
+  @property
+  def namespace(self) -> dict[str, Any]:
+    return self.module.__dict__
+
+  def visit_body(self, body: list[ast.stmt]) -> None:
+    for node in body:
+      self.visit(node)
+
+  def visit(self, node: ast.stmt) -> None:
+    match node:
+      case ast.FunctionDef() | ast.AsyncFunctionDef():
+        self.namespace[node.name] = _make_function(
+            self.module_name, node.name, ast.get_docstring(node)
+        )
+      case ast.ClassDef():
+        self.namespace[node.name] = type(
+            node.name,
+            (),
+            {
+                '__module__': self.module_name,
+                '__qualname__': node.name,
+                '__doc__': ast.get_docstring(node),
+            },
+        )
+      case ast.Assign():
+        for target in node.targets:
+          self._assign(target, node.value)
+      case ast.AnnAssign(value=value) if value is not None:
+        self._assign(
+            node.target,
+            value,
+            is_type_alias=_is_type_alias_annotation(node.annotation),
+        )
+      case ast.Import():
+        for alias in node.names:
+          if alias.asname:
+            self.namespace[alias.asname] = load_module(alias.name)
+          else:  # `import a.b.c` only define `a`
+            name = alias.name.split('.', 1)[0]
+            self.namespace[name] = load_module(name)
+      case ast.ImportFrom():
+        self._import_from(node)
+      # Conditional definitions: All branches are visited (last one wins)
+      case ast.If() | ast.With() | ast.AsyncWith():
+        self.visit_body(node.body)
+        self.visit_body(getattr(node, 'orelse', []))
+      case _ if isinstance(node, _TRY_NODES):
+        for handler in node.handlers:
+          self.visit_body(handler.body)
+        # The `try` body is the expected code path, so has priority
+        self.visit_body(node.body)
+        self.visit_body(node.orelse)
+        self.visit_body(node.finalbody)
+
+  def _assign(
+      self,
+      target: ast.expr,
+      value: ast.expr,
+      *,
+      is_type_alias: bool = False,
+  ) -> None:
+    match target:
+      case ast.Name(id=name):
+        self.namespace[name] = self._infer_value(
+            name, value, is_type_alias=is_type_alias
+        )
+      case ast.Tuple(elts=elts) | ast.List(elts=elts):  # `a, b = ...`
+        for elt in elts:
+          if isinstance(elt, ast.Starred):
+            elt = elt.value
+          self._assign(elt, ast.Constant(value=None))
+      # Attributes and subscripts (`x.y = `, `x[0] = `) are ignored
+
+  def _infer_value(
+      self,
+      name: str,
+      value: ast.expr,
+      *,
+      is_type_alias: bool = False,
+  ) -> Any:
+    if name == '__apitree__':
+      try:
+        return _literal_eval(value)
+      except ValueError:
+        pass
+    match value:
+      case ast.Name(id=other_name) if other_name in self.namespace:
+        return self.namespace[other_name]  # Alias: `x = y`
+      case ast.Call(func=ast.Name('TypeVar') | ast.Attribute(attr='TypeVar')):
+        return typing.TypeVar(name)
+      # `x: TypeAlias = ...`, `Union[]`, `list[int]`, `x | None`, but not
+      # `d['k']` or `FLAG_A | FLAG_B`
+      case ast.Subscript() | ast.BinOp(op=ast.BitOr()) if (
+          is_type_alias or self._is_type_expr(value)
+      ):
+        return typing.Annotated[typing.Any, StaticValue(self.module_name, name)]
+    return StaticValue(self.module_name, name)
+
+  def _is_type_expr(self, node: ast.expr) -> bool:
+    """Returns `True` if the expression statically resolves to a type."""
+    match node:
+      case ast.Constant(value=None):  # `x | None`
+        return True
+      case ast.Name(id=name):
+        if name in self.namespace:
+          value = self.namespace[name]
+        else:
+          value = getattr(builtins, name, None)
+        return isinstance(value, (type, typing.TypeVar)) or (
+            isinstance(value, StaticValue)
+            and value.__module__ in _TYPING_MODULES
+        )
+      case ast.Attribute(value=ast.Name(id=name)):  # `typing.Optional`
+        module = self.namespace.get(name)
+        return (
+            isinstance(module, types.ModuleType)
+            and module.__name__ in _TYPING_MODULES
+        )
+      case ast.Subscript(value=value):
+        return self._is_type_expr(value)
+      case ast.BinOp(op=ast.BitOr(), left=left, right=right):
+        return self._is_type_expr(left) and self._is_type_expr(right)
+    return False
+
+  def _import_from(self, node: ast.ImportFrom) -> None:
+    module_name = import_utils.resolve_relative_import(
+        self.module_name,
+        node.module,
+        level=node.level,
+        is_package=self.module_name == self.module.__package__,
+    )
+    if module_name == '__future__':
+      for alias in node.names:
+        self.namespace[alias.asname or alias.name] = getattr(
+            __future__, alias.name
+        )
+      return
+
+    for alias in node.names:
+      if alias.name == '*':
+        self._import_star(module_name)
+        continue
+      self.namespace[alias.asname or alias.name] = _import_symbol(
+          module_name, alias.name
+      )
+
+  def _import_star(self, module_name: str) -> None:
+    module = load_module(module_name)
+    names = None
+    if getattr(module, '__file__', None) is not None:  # Project source
+      # Read from the source, as the module might still be in construction
+      # (circular imports)
+      names = ast_utils.module_source(module_name).all_names
+    if names is None:
+      names = [k for k in vars(module) if not k.startswith('_')]
+    for name in names:
+      if name in vars(module):
+        self.namespace[name] = vars(module)[name]
+
+
+def _is_type_alias_annotation(annotation: ast.expr) -> bool:
+  match annotation:
+    case ast.Name(id='TypeAlias') | ast.Attribute(attr='TypeAlias'):
+      return True
+  return False
+
+
+def _import_symbol(module_name: str, name: str) -> Any:
+  """Resolve `from module_name import name`."""
+  submodule_name = f'{module_name}.{name}'
+  module = load_module(module_name)
+  if name in vars(module):
+    return vars(module)[name]
+  if _is_submodule(submodule_name):  # `from pkg import submodule`
+    submodule = load_module(submodule_name)
+    setattr(module, name, submodule)
+    return submodule
+  # External or unresolved (e.g. circular imports, dynamic attributes)
+  return StaticValue(module_name, name)
+
+
+def _make_function(
+    module_name: str, name: str, doc: str | None
+) -> types.FunctionType:
+  def fn(*args, **kwargs):
+    raise NotImplementedError(
+        f'{module_name}.{name} is a static placeholder and cannot be called.'
+    )
+
+  fn.__module__ = module_name
+  fn.__name__ = name
+  fn.__qualname__ = name
+  fn.__doc__ = doc
+  return fn
+
+
+def _literal_eval(node: ast.expr) -> Any:
+  """Like `ast.literal_eval`, but also support `dict(x=y)`."""
+  match node:
+    case ast.Call(func=ast.Name(id='dict'), args=[], keywords=keywords):
+      return {k.arg: ast.literal_eval(k.value) for k in keywords}
+  return ast.literal_eval(node)
@@ -2,8 +2,9 @@
 
 import dataclasses
 
-from etils import edc
+from etils import edc, epath
 
+from apitree import git_utils
 from apitree.ext import github_link
 
 
@@ -17,16 +18,43 @@ class ModuleInfo:
     module_name: What to include
     alias: Short name of the module
     github_url: GitHub repository url (for the GitHub links)
+    github_ref: Git branch, tag or commit of the GitHub links (default to
+      `main`, or the current commit if `pin_commit=True`)
+    pin_commit: If `True`, the GitHub links point to the current commit sha
+      (so they never break when the code is updated)
     path_rel_to_imports: By default, get the path relative to the repo.
     should_be_packages: Extra modules that should be concidered package
+    lazy_values: If `True`, symbols which are statically known to be
+      undocumented (private names, magic attributes, external modules imports)
+      are never accessed. This avoid triggering the imports of lazy modules
+      (like `epy.lazy_api_imports`).
+    static: If `True`, the API tree is extracted from the source files, without
+      importing the module. Values are placeholders inferred from the AST, so
+      some symbols might be mis-classified (e.g. an external class re-exported
+      is documented as attribute).
+    max_depth: If set, modules nested deeper than `max_depth` (the root module
+      being `0`) are documented, but their symbols are not extracted.
+    max_symbols_per_page: Maximum number of symbols in the "All symbols" table
+      of the root page. Larger APIs have their table split in separate pages
+      (per symbol type, paginated). `None` to always inline the table.
+    templates_dir: Directory of user templates (`class.md`, `module.md`,...)
+      overwriting the default `apitree/templates/`. Template fields are read
+      from the `Match` attributes (e.g. `{qualname}`, `{docstring_1line}`).
   """
 
   api: str
   module_name: str = None
   alias: str = None
   github_url: str = None
+  github_ref: str = None
+  pin_commit: bool = False
   path_rel_to_imports: bool = False
   should_be_packages: list[str] = dataclasses.field(default_factory=list)
+  lazy_values: bool = False
+  static: bool = False
+  max_depth: int | None = None
+  max_symbols_per_page: int | None = 1000
+  templates_dir: epath.PathLike | None = None
 
   def __post_init__(self):
     if self.module_name is None:
@@ -35,3 +63,7 @@ class ModuleInfo:
       self.alias = self.module_name
     if self.github_url is None:
       self.github_url = github_link.get_github_url()
+    if self.github_ref is None and self.pin_commit:
+      self.github_ref = git_utils.git_info().commit
+    if self.github_ref is None:
+      self.github_ref = 'main'
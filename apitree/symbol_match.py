@@ -3,7 +3,7 @@ from __future__ import annotations
 import dataclasses
 import enum
 import functools
-import inspect
+import json
 import os
 import pathlib
 import sys
@@ -13,9 +13,19 @@ from collections.abc import Callable, Iterator
 from typing import Any
 
 import typing_extensions
-from etils import edc, epath, epy
-
-from apitree import ast_utils, context, md_utils, tree_extractor
+from etils import edc, epy
+
+from apitree import (
+    ast_utils,
+    context,
+    md_utils,
+    object_info,
+    path_utils,
+    profile_utils,
+    slot_utils,
+    template_utils,
+    tree_extractor,
+)
 from apitree.ext import github_link
 
 
@@ -37,8 +47,14 @@ class SymbolType(enum.StrEnum):
 
 
 @edc.dataclass
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Symbol:
+  """Symbol of the API tree.
+
+  Use `__slots__` (rather than `__dict__`) to keep the memory low, as the tree
+  can contain hundred of thousands of symbols.
+  """
+
   name: str
   value: Any
 
@@ -48,34 +64,41 @@ class Symbol:
 
   node: tree_extractor.Node = dataclasses.field(repr=False, init=False)
 
-  @functools.cached_property
+  _is_imported: bool = slot_utils.cache_field()
+  _belong_to_namespace: bool = slot_utils.cache_field()
+  _match: Match = slot_utils.cache_field()
+  _qualname: str = slot_utils.cache_field()
+  _qualname_no_alias: str = slot_utils.cache_field()
+
+  @slot_utils.cached_slot
   def is_imported(self) -> bool:
     return self.name in self.imported_symbols
 
-  @functools.cached_property
-  def imported_symbols(self) -> set[str]:
+  @property
+  def imported_symbols(self) -> frozenset[str]:
     if self.parent.__file__ is None:  # Implicit package
-      return set()
-    # TODO(epot): Cache across module
-    return set(imp.alias for imp in ast_utils.parse_global_imports(self.parent))
+      return frozenset()
+    return _imported_symbols(self.parent.__name__)
 
-  @functools.cached_property
+  @slot_utils.cached_slot
   def belong_to_namespace(self) -> bool:
     return self.value.__name__.startswith(self.ctx.module_name)
 
-  @functools.cached_property
-  def match(self) -> type[Match]:
-    return Match.root_match(self)
+  @slot_utils.cached_slot
+  def match(self) -> Match:
+    profile_utils.count('root_match')
+    with profile_utils.timed('classification'):
+      return Match.root_match(self)
 
-  @functools.cached_property
+  @slot_utils.cached_slot
   def qualname(self) -> str:
     """Exemple: `dca.typing.Float`."""
     if self.parent_symb is None:  # root node
       # assert self.ctx.module_name == self.name
       return self.ctx.alias
-    return f'{self.parent_symb.symbol.qualname}.{self.name}'
+    return sys.intern(f'{self.parent_symb.symbol.qualname}.{self.name}')
 
-  @functools.cached_property
+  @slot_utils.cached_slot
   def qualname_no_alias(self) -> str:
     """Exemple: `dataclass_array.typing.Float`."""
     if isinstance(self.value, types.ModuleType):
@@ -84,7 +107,9 @@ class Symbol:
       except Exception:  # TODO(epot): Better lazy-modules
         return ''
     else:
-      return f'{self.parent_symb.symbol.qualname_no_alias}.{self.name}'
+      return sys.intern(
+          f'{self.parent_symb.symbol.qualname_no_alias}.{self.name}'
+      )
 
   # Return type
 
@@ -98,8 +123,6 @@ class Match:
   docstring_1line: str = ''
   icon: SymbolType = SymbolType.UNKNOWN
 
-  extra_template_kwargs = {}
-
   SUBCLASSES: list[Match] = []
   SKIP_REGISTRATION = False
 
@@ -111,32 +134,35 @@ class Match:
       cls.SUBCLASSES = []
     for parent_cls in cls.__bases__:
       parent_cls.SUBCLASSES.append(cls)
+    _DISPATCH_TABLES.clear()  # Hierarchy updated
 
   @classmethod
   def root_match(cls, symbol: Symbol) -> Match:
-    for subcls in cls.SUBCLASSES:
-      if subcls.__dict__.get('SKIP_REGISTRATION', False):
-        continue
-      all_match = []
-      self = subcls(symbol)
-      for subcls_parents in subcls.mro():
-        if subcls_parents is object:
-          continue
-        if subcls_parents.__dict__.get('SKIP_REGISTRATION', False):
-          continue
-        try:
-          all_match.append(subcls_parents.match(self))
-        except Exception as e:
-          epy.reraise(
-              e, prefix=f'{symbol} ({cls.__name__}) for {subcls.__name__}'
-          )
-
-      if all(all_match):  # Found match
-        return subcls.root_match(symbol)  # Maybe missing values, recurse
-    else:
-      if not cls.SUBCLASSES:  # Leaf
-        return cls(symbol)
-      raise ValueError(f'No match found for {symbol} (in {cls})')
+    # Results of the `match` predicates, shared across all the classes (e.g.
+    # `_IsModule.match` is only evaluated once per symbol).
+    results: dict[Callable[[Match], bool], bool] = {}
+    while True:
+      for subcls, predicates in _dispatch_table(cls):
+        self = None
+        for predicate in predicates:
+          if predicate not in results:
+            if self is None:
+              self = subcls(symbol)
+            try:
+              results[predicate] = bool(predicate(self))
+            except Exception as e:
+              epy.reraise(
+                  e, prefix=f'{symbol} ({cls.__name__}) for {subcls.__name__}'
+              )
+          if not results[predicate]:
+            break
+        else:  # Found match
+          cls = subcls  # Maybe missing values, recurse
+          break
+      else:
+        if not cls.SUBCLASSES:  # Leaf
+          return cls(symbol)
+        raise ValueError(f'No match found for {symbol} (in {cls})')
 
   def match(cls) -> bool:
     return True
@@ -148,56 +174,142 @@ class Match:
     raise ValueError(f'Missing filename for {type(self)}')
 
   @functools.cached_property
-  def template(self) -> str:
+  def url(self) -> str:
+    """Posix `filename`, without the `.md` suffix."""
+    return self.filename.as_posix().removesuffix('.md')
+
+  def relative_url(self, node: tree_extractor.Node) -> str:
+    """Url of the `node` page, relative to this page."""
+    return path_utils.relative_url(self.url, node.match.url)
+
+  @functools.cached_property
+  def template(self) -> template_utils.Template:
     if not self.template_name:
-      return ''
-    return load_template(self.template_name)
+      return template_utils.EMPTY
+    return self._load_template(self.template_name)
+
+  def _load_template(self, template_name: str) -> template_utils.Template:
+    return template_utils.load_template(
+        template_name,
+        templates_dir=self.symbol.ctx.templates_dir,
+    )
 
   @property
-  def content(self):
+  def content(self) -> str:
     # TODO(epot)
     # * Title
     # * Docstring
     # * Signature
     # * Arguments
     # * Source code
-    return self.template.format(
-        qualname=self.symbol.qualname,
-        qualname_no_alias=self.symbol.qualname_no_alias,
-        **self.extra_template_kwargs,
-    )
+    # The template fields are read from the `Match` attributes, so only the
+    # ones used by the template are computed.
+    return self.template.render(self)
+
+  @property
+  def qualname(self) -> str:
+    return self.symbol.qualname
+
+  @property
+  def qualname_no_alias(self) -> str:
+    return self.symbol.qualname_no_alias
 
   def make_symbols_table(self, nodes: Iterator[tree_extractor.Node]):
     table = md_utils.Table(header=['', ''])
 
     for n in nodes:
-      filename = n.match.filename
-      filename = filename.relative_to(self.filename.parent)
-      filename = os.fspath(filename)
-      filename = filename.removesuffix('.md')
-      table.add_row(
-          # f'*{n.match.icon}*',
-          f'[{n.symbol.qualname}]({filename})',
-          f'{n.match.docstring_1line}',
-      )
+      table.add_row(*self._symbol_row(n))
 
     return table.make()
 
+  @functools.cached_property
+  def _symbol_rows(self) -> dict[int, tuple[str, str]]:
+    return {}
+
+  def _symbol_row(self, node: tree_extractor.Node) -> tuple[str, str]:
+    """Row of the symbols table (cached, as shared between the tables)."""
+    row = self._symbol_rows.get(id(node))
+    if row is None:
+      row = (
+          # f'*{n.match.icon}*',
+          f'[{node.symbol.qualname}]({self.relative_url(node)})',
+          f'{node.match.docstring_1line}',
+      )
+      self._symbol_rows[id(node)] = row
+    return row
+
   def make_symbols_tables(self, nodes: tree_extractor.Node) -> str:
-    type_to_childs = epy.groupby(nodes, key=lambda n: n.match.icon)
+    return self._make_groups_tables(_group_by_type(nodes))
+
+  def _make_groups_tables(
+      self, type_to_childs: dict[SymbolType, list[tree_extractor.Node]]
+  ) -> str:
     lines = []
-    for type_ in SymbolType:
-      if type_ not in type_to_childs:
-        continue
+    for type_, childs in type_to_childs.items():
       lines.append('')
       lines.append(f'### {type_.capitalize()}')
       lines.append('')
-
-      childs = type_to_childs[type_]
-      childs = sorted(childs, key=lambda n: n.symbol.qualname)
       lines.append(self.make_symbols_table(childs))
     return '\n'.join(lines)
 
+  @property
+  def extra_pages(self) -> dict[pathlib.Path, str]:
+    """Additional files written next to the page (`filename` -> content)."""
+    return {}
+
+
+def _group_by_type(
+    nodes: Iterator[tree_extractor.Node],
+) -> dict[SymbolType, list[tree_extractor.Node]]:
+  """Group the nodes by type (in `SymbolType` order), sorted by qualname."""
+  type_to_childs = epy.groupby(nodes, key=lambda n: n.match.icon)
+  return {
+      type_: sorted(type_to_childs[type_], key=lambda n: n.symbol.qualname)
+      for type_ in SymbolType
+      if type_ in type_to_childs
+  }
+
+
+# Mapping `Match` class -> `(subclass, predicates)` to try, in order
+_DISPATCH_TABLES: dict[
+    type[Match], list[tuple[type[Match], list[Callable[[Match], bool]]]]
+] = {}
+
+
+def _dispatch_table(
+    cls: type[Match],
+) -> list[tuple[type[Match], list[Callable[[Match], bool]]]]:
+  """Compile the `match` predicates of the direct subclasses of `cls`.
+
+  A subclass matches if all the `match` of its MRO return `True`. The
+  predicates are deduplicated (inherited `match` are only listed once) and
+  evaluated in MRO order.
+
+  Args:
+    cls: The parent class
+
+  Returns:
+    The list of `(subclass, predicates)`, in registration order.
+  """
+  if cls not in _DISPATCH_TABLES:
+    table = []
+    for subcls in cls.SUBCLASSES:
+      if subcls.__dict__.get('SKIP_REGISTRATION', False):
+        continue
+      predicates = []
+      for subcls_parents in subcls.mro():
+        if subcls_parents is object:
+          continue
+        if subcls_parents.__dict__.get('SKIP_REGISTRATION', False):
+          continue
+        predicate = subcls_parents.match
+        if predicate is Match.match or predicate in predicates:
+          continue  # Always `True` or duplicate
+        predicates.append(predicate)
+      table.append((subcls, predicates))
+    _DISPATCH_TABLES[cls] = table
+  return _DISPATCH_TABLES[cls]
+
 
 def _not(cls: type[Match]) -> Callable[[Match], bool]:
   def match(self):
@@ -207,9 +319,56 @@ def _not(cls: type[Match]) -> Callable[[Match], bool]:
 
 
 @functools.cache
-def load_template(template_name):
-  path = epath.resource_path('apitree') / f'templates/{template_name}.md'
-  return path.read_text()
+def _imported_symbols(module_name: str) -> frozenset[str]:
+  """Names imported in the module (shared by all the module symbols)."""
+  return frozenset(_imports(module_name))
+
+
+@functools.cache
+def _imports(module_name: str) -> dict[str, ast_utils.ImportAlias]:
+  imports = ast_utils.module_source(module_name).imports
+  return {imp.alias: imp for imp in imports}
+
+
+def is_undocumented_name(
+    module: types.ModuleType,
+    name: str,
+    *,
+    ctx: Context,
+) -> bool:
+  """Returns `True` if `module.name` is never documented, whatever its value.
+
+  This is decided statically (from the name and the module imports), without
+  accessing the value (which could trigger lazy-imports).
+
+  Args:
+    module: The parent module
+    name: The attribute name
+    ctx: The documented API
+
+  Returns:
+    `True` if the symbol can be skipped.
+  """
+  if name in _MAGIC_MODULE_ATTRIBUTES:
+    return True
+  if getattr(module, '__file__', None) is None:  # Implicit package
+    return False
+  try:
+    imports = _imports(module.__name__)
+  except Exception:  # pylint: disable=broad-except
+    return False  # Source not available (e.g. C++ module)
+  imp = imports.get(name)
+  if imp is None:
+    # Private values (`_PrivateValue`) or not imported modules
+    # (`_ImplicitlyImportedModule`)
+    return name.startswith('_')
+  if imp.namespace.startswith('__future__.'):  # `_FutureAnnotation`
+    return True
+  # `import xxx` of an external module (`_ExternalModule`)
+  root = ctx.module_name
+  return imp.is_module and not (
+      imp.namespace == root or imp.namespace.startswith(f'{root}.')
+  )
 
 
 class _WithDocstring(Match):
@@ -217,10 +376,46 @@ class _WithDocstring(Match):
 
   @property
   def docstring_1line(self) -> str:
-    if not getattr(self.symbol.value, '__doc__', None):
-      return ''
-    else:
-      return self.symbol.value.__doc__.split('\n', 1)[0]
+    return object_info.get(self.symbol.value).docstring_1line
+
+
+class _WithAliases(Match):
+  """Render the duplicated objects as alias of the canonical page.
+
+  When the same object is documented at multiple places, only the first page
+  (canonical) is fully rendered, the other ones link to it.
+  """
+
+  SKIP_REGISTRATION = True
+
+  @property
+  def canonical(self) -> tree_extractor.Node:
+    canonical = object_info.get(self.symbol.value).canonical
+    return canonical or self.symbol.node
+
+  @property
+  def is_alias(self) -> bool:
+    return self.canonical is not self.symbol.node
+
+  @property
+  def template(self) -> template_utils.Template:
+    if self.is_alias:
+      return self._load_template('alias')
+    return super().template
+
+  @property
+  def content(self) -> str:
+    if self.is_alias:
+      profile_utils.count('alias_pages')
+    return super().content
+
+  @property
+  def canonical_qualname(self) -> str:
+    return self.canonical.symbol.qualname
+
+  @property
+  def canonical_url(self) -> str:
+    return self.relative_url(self.canonical)
 
 
 class _IsModule(_WithDocstring, Match):
@@ -230,7 +425,7 @@ class _IsModule(_WithDocstring, Match):
   def match(self) -> bool:
     return isinstance(self.symbol.value, types.ModuleType)
 
-  @property
+  @functools.cached_property
   def filename(self) -> pathlib.Path:
     return (
         self.symbol.parent_symb.match.filename.parent
@@ -239,25 +434,18 @@ class _IsModule(_WithDocstring, Match):
     )
 
   @property
-  def extra_template_kwargs(self):
-    return dict(
-        toctree=self.toctree,
-        symbols_table=self.make_symbols_tables(
-            self.symbol.node.documented_childs
-        ),
-        source_link=github_link.get_module_link(self.symbol.value.__name__),
-        **super().extra_template_kwargs,
-    )
+  def symbols_table(self) -> str:
+    return self.make_symbols_tables(self.symbol.node.documented_childs)
+
+  @property
+  def source_link(self) -> str:
+    return github_link.get_module_link(self.symbol.value.__name__)
 
   @property
   def toctree(self) -> str:
-    items = []
-    for n in self.symbol.node.documented_childs:
-      path = n.match.filename.relative_to(self.filename.parent)
-      path = os.fspath(path)
-      path = path.removesuffix('.md')
-      items.append(path)
-    return '\n'.join(items)
+    return '\n'.join(
+        self.relative_url(n) for n in self.symbol.node.documented_childs
+    )
 
 
 class _RootModule(_IsModule):
@@ -267,20 +455,87 @@ class _RootModule(_IsModule):
   def match(self) -> bool:
     return self.symbol.parent is None
 
-  @property
+  @functools.cached_property
   def filename(self) -> pathlib.Path:
     # return pathlib.Path(self.symbol.name) / 'index.md'
     return pathlib.Path(self.symbol.ctx.alias) / 'index.md'
 
+  @functools.cached_property
+  def _all_symbols(self) -> dict[SymbolType, list[tree_extractor.Node]]:
+    """All the documented nodes of the tree, grouped by type."""
+    return _group_by_type(self.symbol.node.iter_documented_nodes())
+
+  @functools.cached_property
+  def _all_symbols_pages(self) -> list[_AllSymbolsPage]:
+    """Pages of the all symbols index (empty if the index is inlined)."""
+    page_size = self.symbol.ctx.max_symbols_per_page
+    num_symbols = sum(len(nodes) for nodes in self._all_symbols.values())
+    if page_size is None or num_symbols <= page_size:
+      return []
+
+    pages = []
+    for type_, nodes in self._all_symbols.items():
+      num_pages = -(-len(nodes) // page_size)  # ceil
+      for i in range(num_pages):
+        title = type_.capitalize()
+        name = str(type_)
+        if num_pages > 1:
+          title = f'{title} ({i + 1}/{num_pages})'
+          name = f'{name}-{i + 1}'
+        pages.append(
+            _AllSymbolsPage(
+                root=self,
+                title=title,
+                filename=self.filename.parent / '_all' / f'{name}.md',
+                nodes=nodes[i * page_size : (i + 1) * page_size],
+            )
+        )
+    return pages
+
   @property
-  def extra_template_kwargs(self):
-    return dict(
-        **super().extra_template_kwargs,
-        import_statement=self.import_statement,
-        all_symbols_table=self.make_symbols_tables(
-            self.symbol.node.iter_documented_nodes()
-        ),
-    )
+  def all_symbols_table(self) -> str:
+    """Table of all symbols, or links to its pages for large APIs."""
+    if not self._all_symbols_pages:
+      return self._make_groups_tables(self._all_symbols)
+    lines = []
+    for page in self._all_symbols_pages:
+      symbols = 'symbol' if len(page.nodes) == 1 else 'symbols'
+      lines.append(
+          f'* [{page.title}]({page.relative_url})'
+          f' ({len(page.nodes)} {symbols})'
+      )
+    return '\n'.join(lines)
+
+  @property
+  def toctree(self) -> str:
+    lines = [super().toctree]
+    lines.extend(page.relative_url for page in self._all_symbols_pages)
+    return '\n'.join(lines)
+
+  @property
+  def search_index(self) -> str:
+    """Compact JSON index of all symbols (`[qualname, url, type, doc]`).
+
+    Urls (to the html pages) are relative to the index file, which is in the
+    same directory as the root page.
+    """
+    index = [
+        [
+            n.symbol.qualname,
+            f'{self.relative_url(n)}.html',
+            type_,
+            n.match.docstring_1line,
+        ]
+        for type_, nodes in self._all_symbols.items()
+        for n in nodes
+    ]
+    return json.dumps(index, separators=(',', ':'))
+
+  @property
+  def extra_pages(self) -> dict[pathlib.Path, str]:
+    pages = {page.filename: page.content for page in self._all_symbols_pages}
+    pages[self.filename.parent / 'search_index.json'] = self.search_index
+    return pages
 
   @property
   def import_statement(self) -> str:
@@ -309,6 +564,46 @@ class _RootModule(_IsModule):
     )
 
 
+@dataclasses.dataclass(frozen=True)
+class _AllSymbolsPage:
+  """Page of the all symbols index (for APIs too large to be inlined)."""
+
+  root: _RootModule
+  title: str
+  filename: pathlib.Path
+  nodes: list[tree_extractor.Node]
+
+  @property
+  def relative_url(self) -> str:
+    """Url relative to the root page."""
+    return path_utils.relative_url(
+        self.root.url, self.filename.as_posix().removesuffix('.md')
+    )
+
+  @property
+  def qualname(self) -> str:
+    return self.root.symbol.qualname
+
+  @property
+  def symbols_table(self) -> str:
+    table = md_utils.Table(header=['', ''])
+    for n in self.nodes:
+      # Pages are in `_all/`, so urls relative to the root are prefixed by `../`
+      table.add_row(
+          f'[{n.symbol.qualname}](../{self.root.relative_url(n)})',
+          f'{n.match.docstring_1line}',
+      )
+    return table.make()
+
+  @property
+  def content(self) -> str:
+    template = template_utils.load_template(
+        'all_symbols',
+        templates_dir=self.root.symbol.ctx.templates_dir,
+    )
+    return template.render(self)
+
+
 class _ImplicitlyImportedModule(_IsModule):
   """Filter implicitly imported modules."""
 
@@ -325,7 +620,7 @@ class _ExternalModule(_IsModule):
     return not self.symbol.belong_to_namespace
 
 
-class _ApiModule(_IsModule):
+class _ApiModule(_WithAliases, _IsModule):
   """Modules or packages."""
 
   def match(self) -> bool:
@@ -345,7 +640,7 @@ class _ApiModule(_IsModule):
 class _IsValue(Match):
   match = _not(_IsModule)
 
-  @property
+  @functools.cached_property
   def filename(self) -> pathlib.Path:
     return (
         self.symbol.parent_symb.match.filename.parent / f'{self.symbol.name}.md'
@@ -359,21 +654,24 @@ class _PrivateValue(_IsValue):
     return self.symbol.name.startswith('_')
 
 
+_MAGIC_MODULE_ATTRIBUTES = frozenset({
+    '__name__',
+    '__doc__',
+    '__package__',
+    '__loader__',
+    '__spec__',
+    '__path__',
+    '__file__',
+    '__cached__',
+    '__builtins__',
+})
+
+
 class _MagicModuleAttribute(_IsValue):
   documented = False
 
   def match(self):
-    return self.symbol.name in [
-        '__name__',
-        '__doc__',
-        '__package__',
-        '__loader__',
-        '__spec__',
-        '__path__',
-        '__file__',
-        '__cached__',
-        '__builtins__',
-    ]
+    return self.symbol.name in _MAGIC_MODULE_ATTRIBUTES
 
 
 class _FutureAnnotation(_IsValue):
@@ -405,7 +703,7 @@ class _WithSourceLink(Match):
 
     return ast_utils.extract_last_symbol(module_name, name)
 
-  @property
+  @functools.cached_property
   def docstring_1line(self) -> str:
     doc = ' '.join(self._ast_symbol.docstring.split('\n'))
     if len(doc) > 83:  # Truncate
@@ -414,18 +712,18 @@ class _WithSourceLink(Match):
       return doc
 
   @property
-  def extra_template_kwargs(self):
+  def source_link(self) -> str:
     module_name = self.symbol.parent.__name__
     name = self.symbol.name
+    return github_link.get_assignement_link(module_name, name)
 
-    source_link = github_link.get_assignement_link(module_name, name)
+  @property
+  def source_code(self) -> str:
+    return self._ast_symbol.code
 
-    return dict(
-        source_link=source_link,
-        source_code=self._ast_symbol.code,
-        docstring=self._ast_symbol.docstring,
-        **super().extra_template_kwargs,
-    )
+  @property
+  def docstring(self) -> str:
+    return self._ast_symbol.docstring
 
 
 class _TypeAliasValue(_DocumentedValue, _WithSourceLink):
@@ -441,7 +739,7 @@ class _TypeAliasValue(_DocumentedValue, _WithSourceLink):
     )
 
 
-class _ClassValue(_WithDocstring, _DocumentedValue):
+class _ClassValue(_WithAliases, _WithDocstring, _DocumentedValue):
   icon = SymbolType.CLASS
   template_name = 'class'
 
@@ -449,7 +747,7 @@ class _ClassValue(_WithDocstring, _DocumentedValue):
     return isinstance(self.symbol.value, type)
 
 
-class _FunctionValue(_WithDocstring, _DocumentedValue):
+class _FunctionValue(_WithAliases, _WithDocstring, _DocumentedValue):
   icon = SymbolType.FUNCTION
   template_name = 'function'
 
@@ -458,7 +756,7 @@ class _FunctionValue(_WithDocstring, _DocumentedValue):
     # * `@functools.cache`
     # * `@jax.jit`
     # TODO(epot): Could move static_unwrap to `epy` ?
-    obj = _static_unwrap(self.symbol.value)
+    obj = object_info.get(self.symbol.value).unwrapped
     return isinstance(
         obj,
         (
@@ -484,20 +782,3 @@ def _is_package(module: types.ModuleType) -> bool:
     return True
   return module.__name__ == module.__package__
 
-
-def _static_unwrap(func):
-  """Like `inspect.unwrap`, but do not trigger `__getattr__`."""
-  f = func  # remember the original func for error reporting
-  # Memoise by id to tolerate non-hashable objects, but store objects to
-  # ensure they aren't destroyed, which would allow their IDs to be reused.
-  memo = {id(f): f}
-  recursion_limit = sys.getrecursionlimit()
-  while not isinstance(func, type) and inspect.getattr_static(
-      func, '__wrapped__', None
-  ):
-    func = func.__wrapped__
-    id_func = id(func)
-    if (id_func in memo) or (len(memo) >= recursion_limit):
-      raise ValueError('wrapper loop when unwrapping {!r}'.format(f))
-    memo[id_func] = func
-  return func
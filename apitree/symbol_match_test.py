@@ -0,0 +1,71 @@
+from apitree import symbol_match, tree_extractor
+
+
+def test_root_match(make_package):
+  num_groups = 200
+  lines = [
+      'import os',
+      'import typing',
+      'from apitree_match_pkg import sub',
+  ]
+  expected = {
+      'os': '_ExternalModule',
+      'typing': '_ExternalModule',
+      'sub': '_ApiModule',
+  }
+  for i in range(num_groups):
+    lines += [
+        f'class Cls{i}: pass',
+        f'def fn{i}(): pass',
+        f'Alias{i} = typing.TypeVar("Alias{i}")',
+        f'attr{i} = {i}',
+        f'_private{i} = {i}',
+    ]
+    expected |= {
+        f'Cls{i}': '_ClassValue',
+        f'fn{i}': '_FunctionValue',
+        f'Alias{i}': '_TypeAliasValue',
+        f'attr{i}': '_AttributeValue',
+        f'_private{i}': '_PrivateValue',
+    }
+  info = make_package(
+      'apitree_match_pkg',
+      {
+          '__init__.py': '\n'.join(lines),
+          'sub.py': '',
+      },
+  )
+
+  node = tree_extractor.get_api_tree(info)
+  matches = {
+      n.symbol.name: type(symbol_match.Match.root_match(n.symbol)).__name__
+      for n in node.childs
+  }
+  assert {k: matches[k] for k in expected} == expected
+  # The cached match is the same as the dispatched one
+  assert {n.symbol.name: type(n.match).__name__ for n in node.childs} == matches
+
+
+def test_is_undocumented_name(make_package):
+  make_package('apitree_undoc_pkg_other', {'__init__.py': ''})
+  info = make_package(
+      'apitree_undoc_pkg',
+      {
+          '__init__.py': """
+              import os
+              import apitree_undoc_pkg_other
+              import apitree_undoc_pkg.sub
+              """,
+          'sub.py': '',
+      },
+  )
+  module = tree_extractor.get_api_tree(info).symbol.value
+
+  def is_undocumented(name):
+    return symbol_match.is_undocumented_name(module, name, ctx=info)
+
+  assert is_undocumented('os')
+  assert is_undocumented('__name__')
+  # Modules sharing a prefix with the API are external
+  assert is_undocumented('apitree_undoc_pkg_other')
+  assert not is_undocumented('apitree_undoc_pkg')
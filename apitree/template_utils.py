@@ -0,0 +1,97 @@
+"""Page templates."""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import os
+import re
+import string
+from typing import Any, Optional
+
+from etils import epath
+
+
+@dataclasses.dataclass(frozen=True)
+class Template:
+  """Template pre-compiled from a `str.format` markdown file.
+
+  The template is stripped once when loaded (rather than dedenting each
+  rendered page), and the names of its fields are parsed, so only the values
+  used by the template are computed.
+
+  Attributes:
+    text: The template text (stripped)
+    fields: Name of the fields used in the template (e.g. `qualname` for
+      `{qualname}` or `{qualname!r}`)
+    strip: Whether the rendered page should be stripped (if the template
+      starts or ends with a field)
+  """
+
+  text: str
+  fields: tuple[str, ...]
+  strip: bool = False
+
+  @classmethod
+  def from_text(cls, text: str) -> Template:
+    text = text.strip()
+    segments = list(string.Formatter().parse(text))
+    fields = []
+    for _, field_name, _, _ in segments:
+      if field_name is None:
+        continue
+      # `{a.b}` or `{a[0]}` -> `a`
+      name = re.split(r'[.\[]', field_name, maxsplit=1)[0]
+      if not name or name.isdigit():
+        raise ValueError(
+            f'Positional fields are not supported in templates: {text!r}'
+        )
+      if name not in fields:
+        fields.append(name)
+    strip = bool(segments) and (
+        (not segments[0][0] and segments[0][1] is not None)
+        or segments[-1][1] is not None
+    )
+    return cls(text=text, fields=tuple(fields), strip=strip)
+
+  def render(self, obj: Any) -> str:
+    """Render the template, using the `obj` attributes as field values.
+
+    Args:
+      obj: Object from which the fields values are read (with `getattr`)
+
+    Returns:
+      The rendered page
+    """
+    kwargs = {name: getattr(obj, name) for name in self.fields}
+    content = self.text.format_map(kwargs)
+    if self.strip:
+      content = content.strip()
+    return content
+
+
+EMPTY = Template.from_text('')
+
+
+@functools.cache
+def load_template(
+    template_name: str,
+    *,
+    templates_dir: Optional[epath.PathLike] = None,
+) -> Template:
+  """Load the `templates/<template_name>.md` template.
+
+  Args:
+    template_name: Name of the template (e.g. `class`)
+    templates_dir: Directory of the user templates. Templates defined in this
+      directory overwrite the default ones.
+
+  Returns:
+    The compiled template
+  """
+  if templates_dir is not None:
+    path = epath.Path(os.fspath(templates_dir)) / f'{template_name}.md'
+    if path.exists():
+      return Template.from_text(path.read_text())
+  path = epath.resource_path('apitree') / f'templates/{template_name}.md'
+  return Template.from_text(path.read_text())
@@ -0,0 +1,45 @@
+from apitree import template_utils
+
+
+class _Obj:
+
+  def __init__(self):
+    self.accessed = []
+
+  def __getattr__(self, name):
+    self.accessed.append(name)
+    return name.upper()
+
+
+def test_template():
+  template = template_utils.Template.from_text("""
+      # {title}
+
+      {{literal}} {body!r} {title}.
+      """)
+  assert template.fields == ('title', 'body')
+  assert not template.strip
+
+  obj = _Obj()
+  assert template.render(obj) == "# TITLE\n\n      {literal} 'BODY' TITLE."
+  assert obj.accessed == ['title', 'body']  # Only used fields are computed
+
+
+def test_template_strip():
+  template = template_utils.Template.from_text('{body}')
+  assert template.strip
+  assert template.render(type('A', (), {'body': '\n  abc\n'})) == 'abc'
+
+
+def test_load_template(tmp_path):
+  default = template_utils.load_template('class')
+  assert 'autoclass' in default.text
+
+  (tmp_path / 'class.md').write_text('# {qualname}\n\nCustom\n')
+  custom = template_utils.load_template('class', templates_dir=tmp_path)
+  assert custom.text == '# {qualname}\n\nCustom'
+  assert custom.fields == ('qualname',)
+  # Templates missing from the user directory use the default ones
+  assert template_utils.load_template(
+      'function', templates_dir=tmp_path
+  ) == template_utils.load_template('function')
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import collections
 import dataclasses
 import functools
 import importlib
@@ -8,49 +9,121 @@ from typing import Iterator
 
 from etils import edc, epy
 
-from apitree import context, structs, symbol_match
+from apitree import (
+    context,
+    object_info,
+    profile_utils,
+    slot_utils,
+    static_extractor,
+    structs,
+    symbol_match,
+)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, repr=False)
 class Node:
   symbol: symbol_match.Symbol
 
+  _childs: list[Node] = slot_utils.cache_field()
+  _documented_childs: list[Node] = slot_utils.cache_field()
+
   def __post_init__(self):
     self.symbol.node = self
-    context.add_ref(self)
 
   @property
   def match(self):
     return self.symbol.match
 
-  @functools.cached_property
+  @property
+  def depth(self) -> int:
+    """Number of parents of the node (`0` for the root module)."""
+    depth = 0
+    node = self.symbol.parent_symb
+    while node is not None:
+      depth += 1
+      node = node.symbol.parent_symb
+    return depth
+
+  @slot_utils.cached_slot
   def childs(self) -> list[Node]:
     if not self.match.recurse:
       return []
+    if not self._should_expand():
+      profile_utils.count('pruned_modules')
+      return []
     module = self.symbol.value
     all_childs = []
-    # Iterate with `dir` to resolve `epy.lazy_api_imports`
-    for k in dir(module):
-      v = getattr(module, k)
-      symbol = symbol_match.Symbol(
-          name=k,
-          value=v,
-          parent=module,
-          parent_symb=self,
-          ctx=self.symbol.ctx,
-      )
-      all_childs.append(Node(symbol))
+    with profile_utils.timed('extract', module=self.symbol.qualname_no_alias):
+      # Iterate with `dir` to resolve `epy.lazy_api_imports`
+      for k in dir(module):
+        if self.symbol.ctx.lazy_values and symbol_match.is_undocumented_name(
+            module, k, ctx=self.symbol.ctx
+        ):
+          continue  # Do not trigger the lazy-import
+        v = getattr(module, k)
+        symbol = symbol_match.Symbol(
+            name=k,
+            value=v,
+            parent=module,
+            parent_symb=self,
+            ctx=self.symbol.ctx,
+        )
+        all_childs.append(Node(symbol))
+    profile_utils.count('nodes', len(all_childs))
 
     return all_childs
 
-  @functools.cached_property
+  def _should_expand(self) -> bool:
+    """Returns `False` if the module symbols should not be extracted.
+
+    Each module is only expanded once (by its first node), so packages which
+    import themselves (cycles) or re-export other modules are not traversed
+    multiple times. The other nodes are rendered as aliases of the first one.
+
+    Returns:
+      `False` if the module is too deep or already expanded.
+    """
+    max_depth = self.symbol.ctx.max_depth
+    if max_depth is not None and self.depth > max_depth:
+      return False
+    return object_info.set_canonical(self)
+
+  @slot_utils.cached_slot
   def documented_childs(self) -> list[Node]:
     return [n for n in self.childs if n.match.documented]
 
-  def iter_documented_nodes(self) -> Iterator[Node]:
+  def release_values(self) -> None:
+    """Drop the references to the symbol values of the subtree.
+
+    Should only be called once the pages are written (the values are required
+    to classify and render the symbols).
+    """
+    for node in self.iter_nodes():
+      node.symbol.value = None
+      node.symbol.parent = None
+
+  def iter_nodes(self) -> Iterator[Node]:
+    """Iterate over all the nodes already extracted (documented or not)."""
     yield self
-    for c in self.documented_childs:
-      yield from c.iter_documented_nodes()
+    if self._childs is not slot_utils.UNSET:
+      for c in self._childs:
+        yield from c.iter_nodes()
+
+  def iter_documented_nodes(self) -> Iterator[Node]:
+    """Iterate over the documented nodes, breadth-first.
+
+    Breadth-first, so a module (or object) visited multiple times is first
+    expanded at its shallowest location (e.g. `pkg.sub` rather than
+    `pkg.other.sub`).
+
+    Yields:
+      The documented nodes
+    """
+    queue = collections.deque([self])
+    while queue:
+      node = queue.popleft()
+      yield node
+      queue.extend(node.documented_childs)
 
   def __repr__(self) -> str:
     if self.childs:
@@ -65,7 +138,13 @@ class Node:
 
 
 def get_api_tree(info: structs.ModuleInfo):
-  module = importlib.import_module(info.api)
+  object_info.clear()  # Modules expanded by the previous trees
+  static_extractor.clear()  # External modules depend on the documented API
+  with profile_utils.timed('import', module=info.api):
+    if info.static:  # Do not execute the user code
+      module = static_extractor.load_module(info.api)
+    else:
+      module = importlib.import_module(info.api)
 
   # ctx = symbol_match.Context(
   #     module_name=module.__name__,
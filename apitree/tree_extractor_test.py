@@ -0,0 +1,279 @@
+import ast
+import gc
+import sys
+import tracemalloc
+
+from apitree import tree_extractor
+
+
+def test_module_parsed_once(make_package, monkeypatch):
+  num_attributes = 3000
+  info = make_package(
+      'apitree_many_attrs_pkg',
+      {
+          '__init__.py': '\n'.join(
+              ['import os', 'from typing import Any']
+              + [f'x{i} = {i}' for i in range(num_attributes)]
+          ),
+      },
+  )
+
+  parsed = []
+  parse = ast.parse
+
+  def counting_parse(source, *args, **kwargs):
+    parsed.append(source)
+    return parse(source, *args, **kwargs)
+
+  monkeypatch.setattr(ast, 'parse', counting_parse)
+
+  node = tree_extractor.get_api_tree(info)
+  documented = [n.symbol.name for n in node.documented_childs]
+
+  assert len(documented) == num_attributes + 1  # + `Any`
+  # The parent module is parsed once, not once per symbol
+  assert len(parsed) == 1
+
+
+def test_lazy_values(make_package):
+  files = {
+      '__init__.py': """
+          from __future__ import annotations
+
+          import os
+          import typing
+
+          from {name} import public
+
+          _private = 1
+          _accessed = []
+
+
+          def __getattr__(name):
+            _accessed.append(name)
+            if name == '_lazy_private':
+              return 1
+            elif name == 'lazy_public':
+              return 2
+            raise AttributeError(name)
+
+
+          def __dir__():
+            return [*globals(), '_lazy_private', 'lazy_public']
+          """,
+      'public.py': '',
+  }
+
+  def documented_names(lazy_values):
+    name = f'apitree_lazy_pkg_{lazy_values}'
+    info = make_package(
+        name,
+        {k: v.replace('{name}', name) for k, v in files.items()},
+        lazy_values=lazy_values,
+    )
+    node = tree_extractor.get_api_tree(info)
+    names = [n.symbol.name for n in node.documented_childs]
+    return names, node.symbol.value._accessed
+
+  names, accessed = documented_names(lazy_values=False)
+  assert names == ['lazy_public', 'public']
+  assert '_lazy_private' in accessed
+
+  names, accessed = documented_names(lazy_values=True)
+  assert names == ['lazy_public', 'public']
+  assert '_lazy_private' not in accessed  # Private values are never resolved
+
+
+def test_static_extraction(make_package):
+  files = {
+      '__init__.py': """
+          '''Package docstring.'''
+
+          from __future__ import annotations
+
+          import os
+          import typing
+
+          from {name} import sub
+          from {name}.sub import *
+          from .sub import MyClass as AliasClass
+
+          T = typing.TypeVar('T')
+          Array = list[int]
+          OptionalArray = typing.Optional[Array]
+          MaybeInt: typing.TypeAlias = int | None
+          CONSTANT = 1
+          _CONFIG = {'k': 1}
+          FROM_DICT = _CONFIG['k']
+          FLAGS = CONSTANT | 2
+
+          try:
+            from {name}._impl import fast_fn
+          except ImportError:
+            fast_fn = None
+          """,
+      '_impl.py': """
+          def fast_fn():
+            pass
+          """,
+      'sub/__init__.py': """
+          from {name}.sub import lib
+
+          __all__ = ['MyClass', 'my_fn']
+
+
+          class MyClass:
+            '''My class.'''
+
+
+          def my_fn():
+            '''My function.'''
+
+
+          def not_exported():
+            pass
+          """,
+      'sub/lib.py': """
+          import typing
+
+          x: int = 1
+          """,
+  }
+
+  def extract(static):
+    name = f'apitree_static_pkg_{static}'
+    info = make_package(
+        name,
+        {k: v.replace('{name}', name) for k, v in files.items()},
+        static=static,
+    )
+    node = tree_extractor.get_api_tree(info)
+    return {
+        n.symbol.qualname.removeprefix(name): (
+            type(n.match).__name__,
+            n.match.docstring_1line,
+        )
+        for n in node.iter_documented_nodes()
+    }
+
+  expected = extract(static=False)
+  assert expected['.sub.MyClass'] == ('_ClassValue', 'My class.')
+  assert expected['.MaybeInt'][0] == '_TypeAliasValue'
+  assert expected['.FLAGS'][0] != '_TypeAliasValue'
+  assert extract(static=True) == expected
+  assert 'apitree_static_pkg_True' not in sys.modules  # Never imported
+
+
+def test_static_extraction_all_names(make_package):
+  files = {
+      '__init__.py': 'from .a import *',
+      'a.py': """
+          __all__ = ['x']
+          __all__ += ['y']
+
+          x = 1
+          y = 2
+          z = 3
+          """,
+  }
+
+  def documented_names(static):
+    name = f'apitree_static_all_pkg_{static}'
+    info = make_package(name, files, static=static)
+    node = tree_extractor.get_api_tree(info)
+    return [n.symbol.name for n in node.documented_childs]
+
+  # `z` is not exported
+  assert documented_names(static=False) == ['x', 'y']
+  assert documented_names(static=True) == ['x', 'y']
+
+
+def test_static_extraction_external_modules(make_package):
+  make_package('apitree_static_b', {'__init__.py': 'def fn_b():\n  pass'})
+  info_a = make_package(
+      'apitree_static_a',
+      {'__init__.py': 'from apitree_static_b import fn_b'},
+      static=True,
+  )
+  tree_extractor.get_api_tree(info_a)  # `apitree_static_b` is external here
+  info_b = make_package('apitree_static_b', {}, static=True)
+  node = tree_extractor.get_api_tree(info_b)
+  assert [n.symbol.name for n in node.documented_childs] == ['fn_b']
+
+
+def test_module_cycles(make_package):
+  info = make_package(
+      'apitree_cycle_pkg',
+      {
+          '__init__.py': 'from apitree_cycle_pkg import a, b',
+          'a/__init__.py': """
+              import apitree_cycle_pkg
+              from apitree_cycle_pkg import b
+
+              x = 1
+              """,
+          'b/__init__.py': """
+              from apitree_cycle_pkg import a
+
+              y = 1
+              """,
+      },
+  )
+
+  node = tree_extractor.get_api_tree(info)
+  nodes = {
+      n.symbol.qualname: n.documented_childs
+      for n in node.iter_documented_nodes()
+      if n.match.recurse
+  }
+  # Each module is only expanded once
+  assert {k: [c.symbol.name for c in v] for k, v in nodes.items() if v} == {
+      'apitree_cycle_pkg': ['a', 'b'],
+      'apitree_cycle_pkg.a': ['apitree_cycle_pkg', 'b', 'x'],
+      'apitree_cycle_pkg.b': ['a', 'y'],
+  }
+  assert sorted(k for k, v in nodes.items() if not v) == [
+      'apitree_cycle_pkg.a.apitree_cycle_pkg',
+      'apitree_cycle_pkg.a.b',
+      'apitree_cycle_pkg.b.a',
+  ]
+
+  # Depth limit
+  info.max_depth = 0
+  node = tree_extractor.get_api_tree(info)
+  assert [n.symbol.name for n in node.documented_childs] == ['a', 'b']
+  assert all(not n.childs for n in node.documented_childs)
+
+
+def test_memory(make_package):
+  num_attributes = 10_000
+  info = make_package(
+      'apitree_memory_pkg',
+      {'__init__.py': '\n'.join(f'x{i} = {i}' for i in range(num_attributes))},
+  )
+  tree_extractor.get_api_tree(info).documented_childs  # Warm-up the caches
+  node = tree_extractor.get_api_tree(info)
+  node.match  # pylint: disable=pointless-statement
+
+  gc.collect()
+  tracemalloc.start()
+  try:
+    for n in node.childs:  # Compute the cached values
+      _ = (n.symbol.qualname, n.symbol.qualname_no_alias)
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+  finally:
+    tracemalloc.stop()
+
+  # Large blocks are the (amortized) resizes of the shared containers (e.g.
+  # the interned strings table), whose size depends on the previous tests.
+  memory = sum(t.size for t in snapshot.traces if t.size < 64 * 1024)
+  # ~250 bytes (`Node`, `Symbol` and qualname)
+  assert memory / len(node.childs) < 350
+  # No per-instance `__dict__`
+  child = node.childs[0]
+  assert not hasattr(child, '__dict__')
+  assert not hasattr(child.symbol, '__dict__')
+
+  node.release_values()
+  assert all(n.symbol.value is None for n in node.iter_nodes())
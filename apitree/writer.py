@@ -1,9 +1,26 @@
+import collections
+import concurrent.futures
+import functools
 import os
-import types
+from collections.abc import Callable, Iterator
 
-from etils import epath, epy
+from etils import epath
 
-from apitree import context, structs, symbol_match, tree_extractor
+from apitree import (
+    context,
+    object_info,
+    profile_utils,
+    structs,
+    symbol_match,
+    tree_extractor,
+)
+from apitree.ext import github_link
+
+# Pages rendered with autodoc (which calls `linkcode_resolve`)
+_AUTODOC_TYPES = frozenset({
+    symbol_match.SymbolType.CLASS,
+    symbol_match.SymbolType.FUNCTION,
+})
 
 
 def write_doc(
@@ -11,7 +28,26 @@ def write_doc(
     *,
     verbose=True,
     root_dir: epath.Path = None,
-) -> None:
+    incremental: bool = False,
+    num_workers: int | None = None,
+) -> list[epath.Path]:
+  """Write the API pages of the module.
+
+  Pages are rendered and written as the tree is discovered (rather than after
+  the full tree is extracted).
+
+  Args:
+    info: Module to document
+    verbose: If `True`, print a summary of the written pages
+    root_dir: Directory in which write the pages (default to `docs/api`)
+    incremental: If `True`, files which content is unchanged are not
+      re-written, so their mtime is preserved (and Sphinx do not re-read them)
+    num_workers: If set, render and write the pages in parallel with this
+      number of threads
+
+  Returns:
+    The list of all pages of the API (written or unchanged).
+  """
   # TODO(epot): How to use the correct scope for extensions ?
   context.ctx.curr = info
   node = tree_extractor.get_api_tree(info)
@@ -19,16 +55,162 @@ def write_doc(
     root_dir = epath.resource_path(node.symbol.value)
     root_dir = root_dir.parent / 'docs/api'
 
+  dirnames = set()
+  write_fn = functools.partial(
+      _write_node,
+      root_dir=root_dir,
+      dirnames=dirnames,
+      incremental=incremental,
+  )
+  nodes = _iter_pages(node)
+  files = list(_map_bounded(write_fn, nodes, num_workers=num_workers))
+  # Pages of the all symbols index, search index,...
+  for filename, content in node.match.extra_pages.items():
+    files.append(
+        _write_file(
+            root_dir / filename,
+            content,
+            dirnames=dirnames,
+            incremental=incremental,
+        )
+    )
   if verbose:
-    print(node)
+    print(_summary(node, root_dir))
+
+  node.release_values()
+  object_info.clear()
+  return files
 
-  _write_node(root_dir, node)
 
+def _iter_pages(root: tree_extractor.Node) -> Iterator[tree_extractor.Node]:
+  """Yields the nodes to write, as they are discovered.
 
-def _write_node(root_dir: epath.Path, node: tree_extractor.Node) -> None:
-  file = root_dir / node.match.filename
-  file.parent.mkdir(exist_ok=True, parents=True)
-  file.write_text(epy.dedent(node.match.content))
+  The root page is yielded last, as it lists all the symbols of the tree.
 
-  for child in node.documented_childs:
-    _write_node(root_dir, child)
+  Args:
+    root: The root node
+
+  Yields:
+    The documented nodes
+  """
+  for node in root.iter_documented_nodes():
+    context.add_ref(node)
+    # The first page of an object is the canonical one, the next ones are
+    # rendered as aliases
+    is_canonical = object_info.set_canonical(node)
+    if is_canonical and node.match.icon in _AUTODOC_TYPES:
+      _add_source_locations(node)
+    # Extract the childs before the page is rendered (possibly in another
+    # thread), so the tree is only mutated by the main thread
+    node.documented_childs  # pylint: disable=pointless-statement
+    if node is not root:
+      yield node
+  yield root
+
+
+def _add_source_locations(node: tree_extractor.Node) -> None:
+  """Index the source location of the objects documented by autodoc."""
+  if node.symbol.ctx.static:  # Values are placeholders without source
+    return
+  with profile_utils.timed('source_locations'):
+    github_link.add_source_locations(
+        node.symbol.qualname_no_alias, node.symbol.value
+    )
+
+
+def _map_bounded(
+    fn: Callable[[tree_extractor.Node], epath.Path],
+    nodes: Iterator[tree_extractor.Node],
+    *,
+    num_workers: int | None,
+) -> Iterator[epath.Path]:
+  """Like `map`, but in parallel, with a bounded number of pending pages."""
+  if num_workers is None:
+    yield from map(fn, nodes)
+    return
+  with concurrent.futures.ThreadPoolExecutor(num_workers) as executor:
+    pending = collections.deque()
+    for node in nodes:
+      pending.append(executor.submit(fn, node))
+      if len(pending) >= 2 * num_workers:
+        yield pending.popleft().result()
+    while pending:
+      yield pending.popleft().result()
+
+
+def _write_node(
+    node: tree_extractor.Node,
+    *,
+    root_dir: epath.Path,
+    dirnames: set[epath.Path],
+    incremental: bool,
+) -> epath.Path:
+  with profile_utils.timed('render'):
+    content = node.match.content
+  return _write_file(
+      root_dir / node.match.filename,
+      content,
+      dirnames=dirnames,
+      incremental=incremental,
+  )
+
+
+def _write_file(
+    file: epath.Path,
+    content: str,
+    *,
+    dirnames: set[epath.Path],
+    incremental: bool,
+) -> epath.Path:
+  if file.parent not in dirnames:  # Only create each directory once
+    file.parent.mkdir(exist_ok=True, parents=True)
+    dirnames.add(file.parent)
+  with profile_utils.timed('write'):
+    if incremental and file.exists() and file.read_text() == content:
+      profile_utils.count('pages_unchanged')
+      return file  # Skip the write if the content is unchanged
+    file.write_text(content)
+  profile_utils.count('pages_written')
+  profile_utils.count('bytes_written', len(content.encode()))
+  return file
+
+
+def _summary(root: tree_extractor.Node, root_dir: epath.Path) -> str:
+  """One line summary of the written pages (rather than the full tree)."""
+  counter = collections.Counter(
+      n.match.icon for n in root.iter_documented_nodes()
+  )
+  kinds = ', '.join(
+      f'{counter[type_]} {type_}'
+      for type_ in symbol_match.SymbolType
+      if counter[type_]
+  )
+  summary = (
+      f'{root.symbol.qualname}: {counter.total()} pages ({kinds}) written to'
+      f' {root_dir}'
+  )
+  max_depth = root.symbol.ctx.max_depth
+  if max_depth is not None:
+    num_pruned = sum(
+        1
+        for n in root.iter_documented_nodes()
+        if n.match.recurse and n.depth > max_depth
+    )
+    modules = 'module' if num_pruned == 1 else 'modules'
+    summary += f' ({num_pruned} {modules} pruned by max_depth={max_depth})'
+  return summary
+
+
+def remove_stale_files(
+    root_dir: epath.Path,
+    files: list[epath.Path],
+) -> None:
+  """Delete all files from `root_dir` not in `files` (e.g. removed symbols)."""
+  files = {os.fspath(f) for f in files}
+  for dirpath, dirnames, filenames in os.walk(root_dir, topdown=False):
+    for filename in filenames:
+      path = os.path.join(dirpath, filename)
+      if path not in files:
+        os.remove(path)
+    if dirpath != os.fspath(root_dir) and not os.listdir(dirpath):
+      os.rmdir(dirpath)
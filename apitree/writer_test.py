@@ -1,5 +1,10 @@
 """."""
 
+import json
+import os
+import pathlib
+import sys
+
 import pytest
 # import visu3d
 from etils import enp, epath, epy, lazy_imports
@@ -19,6 +24,230 @@ def test_api_tree():
   )
 
 
+def test_write_doc_incremental(tmp_path, make_package):
+  info = make_package(
+      'apitree_incremental_pkg',
+      {
+          '__init__.py': """
+              from apitree_incremental_pkg.lib import MyClass, my_fn
+              """,
+          'lib.py': """
+              class MyClass:
+                pass
+
+              def my_fn():
+                pass
+              """,
+      },
+  )
+  root_dir = epath.Path(tmp_path / 'api')
+
+  files = writer.write_doc(info, root_dir=root_dir, verbose=False)
+  assert {os.fspath(f.relative_to(root_dir)) for f in files} == {
+      'apitree_incremental_pkg/index.md',
+      'apitree_incremental_pkg/MyClass.md',
+      'apitree_incremental_pkg/my_fn.md',
+      'apitree_incremental_pkg/search_index.json',
+  }
+  mtimes = {f: os.stat(f).st_mtime_ns for f in files}
+
+  # Pages of deleted symbols are removed, unchanged pages are kept untouched
+  stale_file = root_dir / 'apitree_incremental_pkg/old_symbol.md'
+  stale_file.write_text('Deleted symbol')
+  files = writer.write_doc(
+      info, root_dir=root_dir, verbose=False, incremental=True
+  )
+  writer.remove_stale_files(root_dir, files)
+  assert not stale_file.exists()
+  assert {f: os.stat(f).st_mtime_ns for f in files} == mtimes
+
+
+def test_write_doc_parallel(tmp_path, make_package):
+  info = make_package(
+      'apitree_parallel_pkg',
+      {
+          '__init__.py': """
+              from apitree_parallel_pkg import sub
+              from apitree_parallel_pkg.sub import *
+              """,
+          'sub/__init__.py': '\n'.join(
+              f'def fn{i}():\n  pass\n' for i in range(20)
+          ),
+      },
+  )
+
+  def read_all(root_dir):
+    return {
+        os.fspath(f.relative_to(root_dir)): f.read_text()
+        for f in pathlib.Path(root_dir).rglob('*.md')
+    }
+
+  root_dir = epath.Path(tmp_path / 'api_sequential')
+  writer.write_doc(info, root_dir=root_dir, verbose=False)
+  expected = read_all(root_dir)
+
+  root_dir = epath.Path(tmp_path / 'api_parallel')
+  files = writer.write_doc(
+      info, root_dir=root_dir, verbose=False, num_workers=4
+  )
+  assert read_all(root_dir) == expected
+  assert 'apitree_parallel_pkg/sub/fn19.md' in expected
+  # The root page (listing all symbols) is written after the other pages
+  assert files[-2:] == [
+      root_dir / 'apitree_parallel_pkg/index.md',
+      root_dir / 'apitree_parallel_pkg/search_index.json',
+  ]
+
+
+def test_write_doc_summary(tmp_path, make_package, capsys):
+  info = make_package(
+      'apitree_summary_pkg',
+      {
+          '__init__.py': """
+              class MyClass:
+                pass
+
+              def my_fn():
+                pass
+              """,
+      },
+  )
+  writer.write_doc(info, root_dir=epath.Path(tmp_path / 'api'))
+  assert capsys.readouterr().out.startswith(
+      'apitree_summary_pkg: 3 pages (1 module, 1 class, 1 function) written to'
+  )
+
+  info = make_package(
+      'apitree_summary_depth_pkg',
+      {
+          '__init__.py': 'from apitree_summary_depth_pkg import sub',
+          'sub/__init__.py': 'from apitree_summary_depth_pkg.sub import sub2',
+          'sub/sub2.py': 'x = 1',
+      },
+      max_depth=0,
+  )
+  writer.write_doc(info, root_dir=epath.Path(tmp_path / 'api'))
+  assert capsys.readouterr().out.rstrip().endswith(
+      '(1 module pruned by max_depth=0)'
+  )
+
+
+def test_write_doc_aliases(tmp_path, make_package):
+  info = make_package(
+      'apitree_aliases_pkg',
+      {
+          '__init__.py': """
+              from apitree_aliases_pkg import sub
+              from apitree_aliases_pkg.sub import MyClass, my_fn
+              """,
+          'sub.py': """
+              class MyClass:
+                pass
+
+              def my_fn():
+                pass
+
+              OtherClass = MyClass
+              """,
+      },
+  )
+  root_dir = epath.Path(tmp_path / 'api')
+  writer.write_doc(info, root_dir=root_dir, verbose=False)
+
+  # The first page is the canonical one
+  content = (root_dir / 'apitree_aliases_pkg/MyClass.md').read_text()
+  assert 'autoclass:: apitree_aliases_pkg.MyClass' in content
+
+  # The other pages are aliases
+  for name, canonical in [
+      ('sub/MyClass', 'MyClass'),
+      ('sub/OtherClass', 'MyClass'),
+      ('sub/my_fn', 'my_fn'),
+  ]:
+    content = (root_dir / f'apitree_aliases_pkg/{name}.md').read_text()
+    assert 'eval-rst' not in content
+    assert (
+        f'Alias of [`apitree_aliases_pkg.{canonical}`](../{canonical})'
+        in content
+    )
+
+
+def test_write_doc_all_symbols_pages(tmp_path, make_package):
+  info = make_package(
+      'apitree_all_symbols_pkg',
+      {
+          '__init__.py': '\n'.join(
+              ['class MyClass:\n  """My class."""\n']
+              + [f'def fn{i}():\n  """Fn {i}."""\n' for i in range(5)]
+          ),
+      },
+      max_symbols_per_page=2,
+  )
+  root_dir = epath.Path(tmp_path / 'api')
+  files = writer.write_doc(info, root_dir=root_dir, verbose=False)
+
+  pkg_dir = root_dir / 'apitree_all_symbols_pkg'
+  assert {os.fspath(f.relative_to(pkg_dir)) for f in files} >= {
+      '_all/module.md',
+      '_all/class.md',
+      '_all/function-1.md',
+      '_all/function-2.md',
+      '_all/function-3.md',
+      'search_index.json',
+  }
+
+  # The root page links to the index pages, rather than inlining the table
+  content = (pkg_dir / 'index.md').read_text()
+  assert '* [Function (1/3)](_all/function-1) (2 symbols)' in content
+  assert '* [Function (3/3)](_all/function-3) (1 symbol)' in content
+  assert '[apitree_all_symbols_pkg.fn4]' not in content
+
+  content = (pkg_dir / '_all/function-3.md').read_text()
+  assert content.startswith('# apitree_all_symbols_pkg: Function (3/3)')
+  assert '[apitree_all_symbols_pkg.fn4](../fn4) | Fn 4.' in content
+
+  index = json.loads((pkg_dir / 'search_index.json').read_text())
+  assert len(index) == 7
+  assert ['apitree_all_symbols_pkg.fn4', 'fn4.html', 'function', 'Fn 4.'] in (
+      index
+  )
+
+
+def test_write_doc_static_reexports(tmp_path, make_package):
+  info = make_package(
+      'apitree_static_reexport_pkg',
+      {
+          '__init__.py': 'from .sub import CONST',
+          'sub.py': 'from .lib import CONST',
+          'lib.py': 'CONST = 1',
+      },
+      static=True,
+  )
+  files = writer.write_doc(
+      info, root_dir=epath.Path(tmp_path / 'api'), verbose=False
+  )
+  assert files
+  assert 'apitree_static_reexport_pkg' not in sys.modules  # Never imported
+
+
+def test_write_doc_optional_dependency(tmp_path, make_package):
+  info = make_package(
+      'apitree_optional_dep_pkg',
+      {
+          '__init__.py': """
+              try:
+                from apitree_not_installed_module import x
+              except ImportError:
+                x = None
+              """,
+      },
+  )
+  root_dir = epath.Path(tmp_path / 'api')
+  writer.write_doc(info, root_dir=root_dir, verbose=False)
+  content = (root_dir / 'apitree_optional_dep_pkg/x.md').read_text()
+  assert 'apitree_optional_dep_pkg/__init__.py#L5' in content
+
+
 if __name__ == '__main__':
   pytest.main()
   # writer.write_doc(visu3d)